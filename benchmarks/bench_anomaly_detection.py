@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AnomalyDetector throughput (samples/s) with different rules enabled
+Usage: python3 benchmarks/bench_anomaly_detection.py [count] [devices]
+"""
+
+import sys
+import random
+
+from common import load_koan, best_of, print_header
+
+
+def make_samples(count, devices, seed=1):
+    """One sample per device per minute; CPU wanders with occasional spikes"""
+    rng = random.Random(seed)
+    cpu = [rng.uniform(20, 60) for _ in range(devices)]
+    samples = []
+    for i in range(count):
+        device = i % devices
+        cpu[device] = min(100.0, max(0.0, cpu[device] + rng.gauss(0, 3)))
+        value = 95.0 if rng.random() < 0.01 else cpu[device]
+        samples.append({"device": f"SW-{device:04d}", "epoch": 1_759_820_400 + 60 * (i // devices), "cpu": value})
+    return samples
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    devices = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    koan = load_koan("network_automation/03_network_monitoring.py")
+    AnomalyDetector = koan["AnomalyDetector"]
+    samples = make_samples(count, devices)
+
+    print_header(f"Anomaly detection, {count:,} samples from {devices:,} devices")
+    setups = [
+        ("threshold, 3 samples sustained", dict(sustained_samples=3)),
+        ("rate of change", dict(threshold=None, max_rise=20)),
+        ("z-score, window 30", dict(threshold=None, z_limit=4)),
+        ("all three rules", dict(sustained_samples=3, max_rise=20, z_limit=4)),
+    ]
+    for name, options in setups:
+        alerts = []
+        elapsed = best_of(lambda: alerts.append(sum(1 for _ in AnomalyDetector(**options).check_many(samples))), 3)
+        print(f"  {name:32} {count / elapsed:12,.0f} samples/s  {alerts[-1]:6,} alerts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled ConfigTemplate and cached ConfigRenderer vs. an f-string per device
+Usage: python3 benchmarks/bench_config_render.py [count]
+"""
+
+import sys
+
+from common import load_koan, best_of, print_header
+from bench_inventory_lookup import make_devices
+
+
+def fstring_config(device):
+    """The original generate_device_config, for comparison"""
+    return f"""
+hostname {device['hostname']}
+interface Vlan{device['vlan']}
+ ip address {device['ip']} 255.255.255.0
+!
+""".strip()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    koan = load_koan("network_automation/02_device_inventory.py")
+    ConfigTemplate = koan["ConfigTemplate"]
+    ConfigRenderer = koan["ConfigRenderer"]
+    generate_device_config = koan["generate_device_config"]
+
+    devices = make_devices(count)
+    access_template = ConfigTemplate("hostname {hostname}\nvlan {vlans}\n{interfaces}")
+    access_switches = [dict(device, interfaces=[{"name": f"Gi0/{port}", "description": f"Port {port}"}
+                                                for port in range(1, 25)])
+                       for device in devices]
+
+    print_header(f"Config rendering, {count:,} devices")
+    print(f"  {'f-string per device (/24 only)':40} "
+          f"{best_of(lambda: [fstring_config(d) for d in devices], 3) * 1000:8.1f} ms")
+    print(f"  {'generate_device_config':40} "
+          f"{best_of(lambda: [generate_device_config(d) for d in devices], 3) * 1000:8.1f} ms")
+
+    print()
+    print("  Access switches with 24 interface blocks each:")
+    renderer = ConfigRenderer(access_template)
+    first = best_of(lambda: renderer.render_all(access_switches), 1)
+    for device in access_switches[::100]:  # 1% of the devices change
+        device["vlan"] += 1
+    again = best_of(lambda: renderer.render_all(access_switches), 1)
+    print(f"  {'first run, everything rendered':40} {first * 1000:8.1f} ms")
+    print(f"  {'second run, 1% changed':40} {again * 1000:8.1f} ms")
+    print(f"  rendered {renderer.rendered:,}, reused {renderer.reused:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming CSV export/import of a large inventory (time and peak memory)
+Usage: python3 benchmarks/bench_inventory_csv.py [count]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+from common import load_koan, print_header
+from bench_inventory_lookup import make_devices
+
+
+def measure(func):
+    """(seconds, peak traced bytes); timed without tracemalloc, which slows things down"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    koan = load_koan("network_automation/02_device_inventory.py")
+    export_to_csv = koan["export_to_csv"]
+    iter_csv_devices = koan["iter_csv_devices"]
+    parse_csv_to_devices = koan["parse_csv_to_devices"]
+
+    devices = make_devices(count)
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        def write():
+            with open(path, "w", newline="") as f:
+                export_to_csv(iter(devices), f)
+
+        def read_streaming():
+            with open(path, newline="") as f:
+                for _ in iter_csv_devices(f):
+                    pass
+
+        def read_all():
+            with open(path, newline="") as f:
+                parse_csv_to_devices(f.read())
+
+        write()
+        print_header(f"Inventory CSV, {count:,} devices, {os.path.getsize(path):,} bytes")
+        for name, func in (("export_to_csv(devices, file)", write),
+                           ("iter_csv_devices(file)", read_streaming),
+                           ("parse_csv_to_devices(text)", read_all)):
+            elapsed, peak = measure(func)
+            print(f"  {name:30} {elapsed * 1000:8.1f} ms  {count / elapsed:10,.0f} rows/s  "
+                  f"peak {peak / 1024:10,.0f} KiB")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
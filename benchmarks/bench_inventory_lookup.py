@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DeviceInventory index lookups vs. linear scans over a list of dicts
+Usage: python3 benchmarks/bench_inventory_lookup.py [count]
+"""
+
+import sys
+import random
+
+from common import load_koan, best_of, print_header
+
+TYPES = ["Switch", "Router", "Firewall", "Access Point"]
+LOCATIONS = [f"Floor {n}" for n in range(1, 21)] + ["Server Room", "DMZ"]
+
+
+def make_devices(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            "hostname": f"DEV-{i:06d}",
+            "ip": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+            "type": rng.choice(TYPES),
+            "vlan": rng.randrange(1, 100),
+            "location": rng.choice(LOCATIONS),
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    koan = load_koan("network_automation/02_device_inventory.py")
+    DeviceInventory = koan["DeviceInventory"]
+    find_device_by_hostname = koan["find_device_by_hostname"]
+    get_devices_by_location = koan["get_devices_by_location"]
+    update_device_ip = koan["update_device_ip"]
+
+    devices = make_devices(count)
+    inventory = DeviceInventory(dict(device) for device in devices)
+    rng = random.Random(2)
+    wanted = [f"DEV-{rng.randrange(count):06d}" for _ in range(200)]
+
+    print_header(f"Inventory queries, {count:,} devices, {len(wanted)} lookups each")
+    print(f"  {'Build DeviceInventory':34} "
+          f"{best_of(lambda: DeviceInventory(devices), 3) * 1000:8.1f} ms")
+    for name, container in (("list", devices), ("DeviceInventory", inventory)):
+        find = best_of(lambda: [find_device_by_hostname(container, h) for h in wanted], 3)
+        location = best_of(lambda: [get_devices_by_location(container, "DMZ") for _ in wanted], 3)
+        update = best_of(lambda: [update_device_ip(container, h, f"172.16.0.{n}")
+                                  for n, h in enumerate(wanted)], 1)
+        print(f"  {name:16} find {find * 1000:8.1f} ms  "
+              f"by location {location * 1000:8.1f} ms  update ip {update * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
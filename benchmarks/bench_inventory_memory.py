@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory per device, list of dicts vs. ColumnarInventory
+Usage: python3 benchmarks/bench_inventory_memory.py [count ...]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from common import load_koan, print_header
+from bench_inventory_lookup import make_devices
+
+
+def traced_size(build):
+    """Bytes still allocated by build() once it has returned"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    koan = load_koan("network_automation/02_device_inventory.py")
+    ColumnarInventory = koan["ColumnarInventory"]
+
+    print_header("Inventory memory, bytes per device")
+    print(f"  {'devices':>10} {'list of dicts':>15} {'columnar':>10} {'ratio':>7}")
+    for count in counts:
+        # Build from an iterator so the source dicts are not counted twice
+        dicts = traced_size(lambda: make_devices(count))
+        columnar = traced_size(lambda: ColumnarInventory(iter_devices(count)))
+        print(f"  {count:>10,} {dicts / count:>15.1f} {columnar / count:>10.1f} "
+              f"{dicts / columnar:>6.1f}x")
+
+
+def iter_devices(count, chunk=10_000):
+    """make_devices() in chunks, so only one chunk of dicts is alive at a time"""
+    for start in range(0, count, chunk):
+        for device in make_devices(min(chunk, count - start), seed=start):
+            i = start + int(device["hostname"][4:])
+            device["hostname"] = f"DEV-{i:06d}"
+            device["ip"] = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"  # IPs must be unique too
+            yield device
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batch IPv4 validation vs. the single-address is_valid_ip
+Usage: python3 benchmarks/bench_ip_validation.py [count]
+"""
+
+import sys
+import random
+
+from common import load_koan, best_of, print_header
+
+
+def make_addresses(count, seed=1):
+    """Mostly valid addresses with some typical garbage mixed in"""
+    rng = random.Random(seed)
+    garbage = ["256.1.1.1", "10.0.0", "1.2.3.a", " 1.2.3.4", "+1.2.3.4", "1..3.4", ""]
+    addresses = []
+    for i in range(count):
+        if i % 10 == 0:
+            addresses.append(rng.choice(garbage))
+        else:
+            addresses.append(".".join(str(rng.randrange(256)) for _ in range(4)))
+    return addresses
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    koan = load_koan("network_automation/01_ip_address_validation.py")
+    is_valid_ip = koan["is_valid_ip"]
+    validate_ip_batch = koan["validate_ip_batch"]
+
+    addresses = make_addresses(count)
+    buffer = "\n".join(addresses).encode("ascii")
+
+    backend = "NumPy" if koan["np"] is not None else "array('I')"
+    print_header(f"IPv4 validation, {count:,} addresses (batch backend: {backend})")
+
+    timings = [
+        ("is_valid_ip (loop)", best_of(lambda: [is_valid_ip(a) for a in addresses], 3)),
+        ("validate_ip_batch (list)", best_of(lambda: validate_ip_batch(addresses), 3)),
+        ("validate_ip_batch (bytes)", best_of(lambda: validate_ip_batch(buffer), 3)),
+    ]
+    baseline = timings[0][1]
+    for name, elapsed in timings:
+        rate = count / elapsed
+        print(f"  {name:28} {elapsed * 1000:9.1f} ms  {rate:13,.0f} addr/s  {baseline / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: KeywordMatcher (one trie-shaped regex) vs. a substring loop per keyword
+Usage: python3 benchmarks/bench_keyword_matching.py [messages]
+"""
+
+import re
+import sys
+import random
+import string
+
+from common import load_koan, best_of, print_header
+from bench_log_parsing import make_log_lines
+
+
+def make_keywords(count, seed=1):
+    """Indicator strings: the usual keywords, then IPs, hashes and made-up words"""
+    rng = random.Random(seed)
+    keywords = ["DOWN", "loop detected", "Unauthorized", "failed"]
+    while len(keywords) < count:
+        kind = len(keywords) % 3
+        if kind == 0:
+            keywords.append(f"198.51.{rng.randrange(256)}.{rng.randrange(256)}")
+        elif kind == 1:
+            keywords.append("".join(rng.choice("0123456789abcdef") for _ in range(12)))
+        else:
+            keywords.append("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randrange(5, 12))))
+    return keywords[:count]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    koan = load_koan("network_automation/03_network_monitoring.py")
+    KeywordMatcher = koan["KeywordMatcher"]
+    messages = [line.split(" | ", 3)[3] for line in make_log_lines(count)]
+
+    print_header(f"Critical keyword matching, {count:,} messages")
+    print(f"  {'keywords':>8} {'substring loop':>16} {'plain a|b|c regex':>18} {'KeywordMatcher':>15}")
+    for keyword_count in (10, 100, 5000):
+        keywords = make_keywords(keyword_count)
+        plain = re.compile("|".join(map(re.escape, keywords)))
+        matcher = KeywordMatcher(keywords)
+
+        def substring_loop():
+            return [m for m in messages if any(keyword in m for keyword in keywords)]
+
+        loop = best_of(substring_loop, 1)
+        alternation = best_of(lambda: [m for m in messages if plain.search(m)], 1)
+        trie = best_of(lambda: [m for m in messages if matcher.regex.search(m)], 1)
+        assert len(substring_loop()) == len([m for m in messages if matcher.regex.search(m)])
+        print(f"  {keyword_count:>8,} {loop * 1000:>13.1f} ms {alternation * 1000:>15.1f} ms "
+              f"{trie * 1000:>12.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parse_log_rows (tuple) and parse_log_records (LogRecord) vs. parse_log_entry (dict per line)
+Usage: python3 benchmarks/bench_log_parsing.py [count]
+"""
+
+import sys
+import random
+import tracemalloc
+
+from common import load_koan, best_of, print_header
+
+DEVICES = [f"SW-{n:03d}" for n in range(200)] + ["CORE-SW-01", "EDGE-RTR-01", "FW-01"]
+EVENTS = [
+    ("INFO", "Port Gi0/{port} is UP"),
+    ("WARNING", "High CPU usage: {cpu}%"),
+    ("ERROR", "Port Gi0/{port} is DOWN"),
+    ("INFO", "BGP neighbor 203.0.113.{port} established"),
+    ("ERROR", "Unauthorized access attempt from 192.168.1.{port}"),
+]
+
+
+def make_log_lines(count, seed=1):
+    """Syslog-like lines over one day, roughly in time order"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        second = i * 86400 // count
+        level, message = rng.choice(EVENTS)
+        lines.append(f"2025-10-07 {second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d} | "
+                     f"{rng.choice(DEVICES)} | {level} | "
+                     f"{message.format(port=rng.randrange(1, 49), cpu=rng.randrange(50, 100))}")
+    return lines
+
+
+def traced_size(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    koan = load_koan("network_automation/03_network_monitoring.py")
+    parse_log_entry = koan["parse_log_entry"]
+    parse_log_rows = koan["parse_log_rows"]
+    parse_log_records = koan["parse_log_records"]
+
+    lines = make_log_lines(count)
+    print_header(f"Log parsing, {count:,} lines")
+    for name, parse in (("parse_log_entry (dict)", lambda: [parse_log_entry(line) for line in lines]),
+                        ("parse_log_rows (tuple)", lambda: list(parse_log_rows(lines))),
+                        ("parse_log_records (LogRecord)", lambda: list(parse_log_records(lines)))):
+        elapsed = best_of(parse, 3)
+        size = traced_size(parse)
+        print(f"  {name:32} {count / elapsed:12,.0f} lines/s  {size / count:6.1f} bytes/record")
+
+
+if __name__ == "__main__":
+    main()
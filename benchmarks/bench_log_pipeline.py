@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming LogPipeline from a file vs. lists passed between functions
+Usage: python3 benchmarks/bench_log_pipeline.py [count]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+from common import load_koan, print_header
+from bench_log_parsing import make_log_lines
+
+
+def measure(func):
+    """(seconds, peak traced bytes); timed without tracemalloc, which slows things down"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    koan = load_koan("network_automation/03_network_monitoring.py")
+    parse_all_logs = koan["parse_all_logs"]
+    filter_by_level = koan["filter_by_level"]
+    detect_critical_issues = koan["detect_critical_issues"]
+    count_logs_by_device = koan["count_logs_by_device"]
+    LogPipeline = koan["LogPipeline"]
+    read_log_lines = koan["read_log_lines"]
+
+    fd, path = tempfile.mkstemp(suffix=".log")
+    with os.fdopen(fd, "w") as log_file:
+        log_file.writelines(line + "\n" for line in make_log_lines(count))
+    try:
+        def with_lists():
+            with open(path) as log_file:
+                logs = parse_all_logs(log_file.read().splitlines())
+            return (len(logs), len(filter_by_level(logs, "ERROR")), len(filter_by_level(logs, "WARNING")),
+                    len(detect_critical_issues(logs)), count_logs_by_device(logs))
+
+        def with_pipeline():
+            return LogPipeline(read_log_lines(path)).summarize()
+
+        print_header(f"Log report, {count:,} lines, {os.path.getsize(path):,} bytes")
+        for name, func in (("lists between functions", with_lists), ("LogPipeline, one pass", with_pipeline)):
+            elapsed, peak = measure(func)
+            print(f"  {name:26} {elapsed * 1000:8.1f} ms  {count / elapsed:10,.0f} lines/s  "
+                  f"peak {peak / 1024:10,.0f} KiB")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
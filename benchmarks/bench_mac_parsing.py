@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bulk MAC parsing into a MacTable vs. is_valid_mac per string
+Usage: python3 benchmarks/bench_mac_parsing.py [count]
+"""
+
+import sys
+import random
+import tracemalloc
+
+from common import load_koan, best_of, print_header
+
+
+def make_cam_table(count, seed=1):
+    """MAC addresses from 50 vendors in colon, dash and Cisco notation, with duplicates"""
+    rng = random.Random(seed)
+    ouis = [rng.getrandbits(24) for _ in range(50)]
+    pool = [rng.choice(ouis) << 24 | rng.getrandbits(24) for _ in range(count // 4)]
+    entries = []
+    for i in range(count):
+        digits = f"{rng.choice(pool):012x}"
+        style = i % 3
+        if style == 0:
+            entries.append(":".join(digits[j:j + 2] for j in range(0, 12, 2)).upper())
+        elif style == 1:
+            entries.append("-".join(digits[j:j + 2] for j in range(0, 12, 2)))
+        else:
+            entries.append(f"{digits[0:4]}.{digits[4:8]}.{digits[8:12]}")
+    return entries
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def looked_up(table):
+    """The table after one membership test, so that its sorted copy exists"""
+    0 in table
+    return table
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    koan = load_koan("network_automation/01_ip_address_validation.py")
+    is_valid_mac = koan["is_valid_mac"]
+    MacTable = koan["MacTable"]
+
+    entries = make_cam_table(count)
+    colon_entries = [entry for entry in entries if ":" in entry]
+
+    print_header(f"MAC parsing, {count:,} CAM entries in mixed formats")
+    timings = [
+        (f"is_valid_mac ({len(colon_entries):,} colon only)",
+         best_of(lambda: [is_valid_mac(e) for e in colon_entries], 3), len(colon_entries)),
+        ("MacTable(entries)", best_of(lambda: MacTable(entries), 3), count),
+        ("MacTable(entries).unique()", best_of(lambda: MacTable(entries).unique(), 3), count),
+    ]
+    for name, elapsed, n in timings:
+        print(f"  {name:34} {elapsed * 1000:8.1f} ms  {n / elapsed:12,.0f} MAC/s")
+
+    table = MacTable(entries)
+    probes = entries[::max(1, count // 1000)]
+    lookups = [
+        (f"{len(probes):,} lookups in entries (list)", best_of(lambda: [e in entries for e in probes], 3), len(probes)),
+        (f"{len(probes):,} lookups in MacTable", best_of(lambda: [e in table for e in probes], 3), len(probes)),
+        ("count_by_oui()", best_of(table.count_by_oui, 3), count),
+    ]
+    for name, elapsed, n in lookups:
+        print(f"  {name:34} {elapsed * 1000:8.1f} ms")
+
+    _, list_size = measure_memory(lambda: [e.upper() for e in entries])
+    _, table_size = measure_memory(lambda: MacTable(entries))
+    _, searched_size = measure_memory(lambda: looked_up(MacTable(entries)))
+    print()
+    print(f"  Memory as list of strings: {list_size / count:6.1f} bytes/MAC")
+    print(f"  Memory as MacTable:        {table_size / count:6.1f} bytes/MAC")
+    print(f"  ... after a lookup:        {searched_size / count:6.1f} bytes/MAC (sorted copy for bisect)")
+
+
+if __name__ == "__main__":
+    main()
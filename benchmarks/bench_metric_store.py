@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MetricStore (typed columns, optionally memory-mapped) vs. a list of metric dicts
+Usage: python3 benchmarks/bench_metric_store.py [count] [devices]
+"""
+
+import sys
+import random
+import tempfile
+import tracemalloc
+
+from common import load_koan, best_of, print_header
+
+
+def make_samples(count, devices, seed=1):
+    """One sample per device per minute, in time order"""
+    rng = random.Random(seed)
+    start = 1_759_795_200  # 2025-10-07 00:00 UTC
+    return [{"device": f"SW-{i % devices:03d}", "epoch": start + 60 * (i // devices),
+             "cpu": rng.randrange(5, 100), "memory": rng.randrange(20, 90), "bandwidth": rng.randrange(1000)}
+            for i in range(count)]
+
+
+def traced_size(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    devices = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    koan = load_koan("network_automation/03_network_monitoring.py")
+    MetricStore = koan["MetricStore"]
+    calculate_average_cpu = koan["calculate_average_cpu"]
+    backend = "NumPy" if koan["np"] is not None else "array + plain Python"
+
+    samples = make_samples(count, devices)
+    store = MetricStore().add_samples(samples)
+    last_epoch = samples[-1]["epoch"]
+    device = "SW-007"
+
+    print_header(f"Metric store ({backend}), {count:,} samples from {devices} devices")
+    dict_size = traced_size(lambda: make_samples(count // 10, devices)) * 10
+    store_size = traced_size(lambda: MetricStore().add_samples(make_samples(count // 10, devices))) * 10
+    print(f"  memory: list of dicts {dict_size / count:6.1f} bytes/sample, "
+          f"MetricStore {store_size / count:6.1f} bytes/sample")
+    print()
+
+    def last_hour_from_list():
+        values = [s["cpu"] for s in samples if s["device"] == device and s["epoch"] >= last_epoch - 3600]
+        return sum(values) / len(values)
+
+    timings = [
+        ("average CPU, list scan", lambda: calculate_average_cpu(samples, device)),
+        ("average CPU, MetricStore", lambda: store.aggregate(device, "cpu")["mean"]),
+        ("last hour, list scan", last_hour_from_list),
+        ("last hour, MetricStore", lambda: store.aggregate(device, "cpu", start=last_epoch - 3600)["mean"]),
+        ("hourly max, MetricStore", lambda: store.downsample(device, "cpu", 3600, "max")),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        store.save(directory)
+        mapped = MetricStore.open(directory)
+        timings.append(("average CPU, memory-mapped", lambda: mapped.aggregate(device, "cpu")["mean"]))
+        for name, func in timings:
+            print(f"  {name:30} {best_of(func, 5) * 1000:10.3f} ms")
+        mapped.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+
+import io
+import time
+import runpy
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SOLVED_DIR = Path(__file__).resolve().parent.parent / "tests" / "solved_koans"
+
+
+def load_koan(relative_path):
+    """Run a solved koan quietly and return its namespace"""
+    with redirect_stdout(io.StringIO()):
+        return runpy.run_path(str(SOLVED_DIR / relative_path))
+
+
+def best_of(func, repeat=5):
+    """Return the best wall time of func() in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def print_header(title):
+    print("=" * 70)
+    print(title)
+    print("=" * 70)
@@ -22,12 +22,18 @@ assert octets[3] == "100", "Fix this: what is the last octet?"
 
 # Validate IP address - all octets should be 0-255
 def is_valid_octet(octet):
+    # int() would crash on "a1" and accept " 1" or "+1", so check the digits first
+    if not (octet.isascii() and octet.isdigit()):
+        return False
     num = int(octet)
     return 0 <= num <= 255
 
 assert is_valid_octet("192") == True, "Fix this: is 192 a valid octet?"
 assert is_valid_octet("300") == False, "Fix this: is 300 a valid octet?"
 assert is_valid_octet("0") == True, "Fix this: is 0 a valid octet?"
+assert is_valid_octet("a1") == False, "Fix this: is a1 a valid octet?"
+assert is_valid_octet("+1") == False, "Fix this: is +1 a valid octet?"
+assert is_valid_octet("") == False, "Fix this: is an empty string a valid octet?"
 
 # Complete IP validation function
 def is_valid_ip(ip_string):
@@ -50,58 +56,326 @@ assert ip_part == "192.168.1.0", "Fix this: what is the IP part?"
 assert prefix == "24", "Fix this: what is the prefix length?"
 assert int(prefix) == 24, "Fix this: what is the prefix as a number?"
 
-# Subnet mask calculation (simplified)
+# Subnet mask calculation
+# A /n mask is n one-bits followed by (32 - n) zero-bits. All 33 masks are
+# computed once, so looking one up is just a list index.
+PREFIX_MASKS = [(0xFFFFFFFF << (32 - n)) & 0xFFFFFFFF for n in range(33)]
+
+def int_to_ip(number):
+    """Turn a 32-bit integer back into dotted notation"""
+    return f"{number >> 24}.{(number >> 16) & 255}.{(number >> 8) & 255}.{number & 255}"
+
+SUBNET_MASKS = [int_to_ip(mask) for mask in PREFIX_MASKS]
+
 def prefix_to_subnet_mask(prefix_length):
-    if prefix_length == 24:
-        return "255.255.255.0"
-    elif prefix_length == 16:
-        return "255.255.0.0"
-    elif prefix_length == 8:
-        return "255.0.0.0"
+    if isinstance(prefix_length, int) and 0 <= prefix_length <= 32:
+        return SUBNET_MASKS[prefix_length]
     return "Unknown"
 
 assert prefix_to_subnet_mask(24) == "255.255.255.0", "Fix this: what is /24 subnet mask?"
 assert prefix_to_subnet_mask(16) == "255.255.0.0", "Fix this: what is /16 subnet mask?"
+assert prefix_to_subnet_mask(26) == "255.255.255.192", "Fix this: what is /26 subnet mask?"
+assert prefix_to_subnet_mask(0) == "0.0.0.0", "Fix this: what is /0 subnet mask?"
+assert prefix_to_subnet_mask(33) == "Unknown", "Fix this: is /33 a valid prefix?"
+
+# Prefix math on integers
+# An address is just a 32-bit number, so network, broadcast and "is this
+# address in that subnet?" are single bit operations (& | ^) on integers.
+WILDCARD_MASKS = [mask ^ 0xFFFFFFFF for mask in PREFIX_MASKS]
+
+# Usable hosts: all addresses minus network and broadcast, except /31
+# point-to-point links (2 hosts, RFC 3021) and /32 host routes (1 host)
+HOST_COUNTS = [2 ** (32 - n) - 2 for n in range(31)] + [2, 1]
+
+def ip_to_int(ip):
+    """Turn a dotted IP address into a 32-bit integer"""
+    a, b, c, d = map(int, ip.split("."))
+    # Any bit above the lowest 8 (including the sign of a negative number)
+    # means an octet is outside 0-255
+    if (a | b | c | d) & ~255:
+        raise ValueError(f"invalid IPv4 address: {ip!r}")
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+def check_prefix(prefix):
+    """Return prefix if it is a valid prefix length, else raise ValueError
+
+    The mask tables are plain lists, so without this check /-1 would
+    quietly index from the end of the table and mean /32.
+    """
+    if not 0 <= prefix <= 32:
+        raise ValueError(f"invalid prefix length: /{prefix}")
+    return prefix
+
+def parse_cidr(cidr):
+    """Return (network, prefix) as integers, e.g. "10.1.2.3/8" -> (10.0.0.0, 8)"""
+    ip, prefix = cidr.split("/")
+    prefix = check_prefix(int(prefix))
+    return ip_to_int(ip) & PREFIX_MASKS[prefix], prefix
+
+def network_address(ip, prefix):
+    return ip & PREFIX_MASKS[check_prefix(prefix)]
+
+def broadcast_address(ip, prefix):
+    prefix = check_prefix(prefix)
+    return (ip & PREFIX_MASKS[prefix]) | WILDCARD_MASKS[prefix]
+
+def host_count(prefix):
+    return HOST_COUNTS[check_prefix(prefix)]
+
+def wildcard_mask(prefix):
+    """Inverse mask as used in Cisco ACLs and OSPF, e.g. /24 -> 0.0.0.255"""
+    return WILDCARD_MASKS[check_prefix(prefix)]
+
+def prefix_contains(network, prefix, ip):
+    """Is the address ip inside network/prefix?"""
+    return (ip & PREFIX_MASKS[check_prefix(prefix)]) == network
+
+def subnet_contains(network, prefix, other_network, other_prefix):
+    """Is the subnet other_network/other_prefix completely inside network/prefix?"""
+    prefix, other_prefix = check_prefix(prefix), check_prefix(other_prefix)
+    return prefix <= other_prefix and (other_network & PREFIX_MASKS[prefix]) == network
+
+office_ip = ip_to_int("192.168.10.77")
+assert int_to_ip(office_ip) == "192.168.10.77", "Fix this: does the integer convert back?"
+assert int_to_ip(network_address(office_ip, 26)) == "192.168.10.64", "Fix this: what is the /26 network?"
+assert int_to_ip(broadcast_address(office_ip, 26)) == "192.168.10.127", "Fix this: what is the /26 broadcast?"
+assert host_count(26) == 62, "Fix this: how many hosts in a /26?"
+assert host_count(31) == 2, "Fix this: how many hosts on a /31 link?"
+assert int_to_ip(wildcard_mask(24)) == "0.0.0.255", "Fix this: what is the /24 wildcard mask?"
+
+lan, lan_prefix = parse_cidr("192.168.10.0/24")
+assert prefix_contains(lan, lan_prefix, office_ip) == True, "Fix this: is the office IP in the LAN?"
+assert prefix_contains(lan, lan_prefix, ip_to_int("192.168.11.1")) == False, "Fix this: is 192.168.11.1 in the LAN?"
+assert subnet_contains(lan, lan_prefix, *parse_cidr("192.168.10.64/26")) == True, "Fix this: is the /26 inside the /24?"
+assert subnet_contains(*parse_cidr("192.168.10.64/26"), lan, lan_prefix) == False, "Fix this: is the /24 inside the /26?"
+
+# Out-of-range input is an error, not a silently wrong answer
+for bad_cidr in ["10.0.0.0/-1", "10.0.0.0/33", "300.0.0.0/8", "10.-1.0.0/8"]:
+    try:
+        parse_cidr(bad_cidr)
+        rejected = False
+    except ValueError:
+        rejected = True
+    assert rejected == True, f"Fix this: is {bad_cidr} a valid prefix?"
+try:
+    host_count(-1)
+    rejected = False
+except ValueError:
+    rejected = True
+assert rejected == True, "Fix this: how many hosts in a /-1?"
+try:
+    subnet_contains(0, 40, 0, 24)
+    rejected = False
+except ValueError:
+    rejected = True
+assert rejected == True, "Fix this: can a /40 contain a /24?"
+
+# Longest-prefix match
+# Routers pick the most specific route that matches an address. A binary
+# trie does the same: walk the address bit by bit (at most 32 steps) and
+# remember the last prefix passed on the way, no matter how many prefixes
+# (RFC1918, bogons, customer blocks, ACL sources...) are stored.
+class PrefixTrie:
+    """Map prefixes to metadata and find the longest match for an address"""
+
+    def __init__(self):
+        # Every node is [child for bit 0, child for bit 1, (cidr, metadata) or None]
+        self.root = [None, None, None]
+        self.count = 0
+
+    def insert(self, cidr, metadata=None):
+        # parse_cidr raises for prefixes outside 0-32; a /-1 would otherwise
+        # walk no bits and land on the root, turning it into a default route
+        network, prefix = parse_cidr(cidr)
+        node = self.root
+        for shift in range(31, 31 - prefix, -1):
+            bit = (network >> shift) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+        if node[2] is None:
+            self.count += 1
+        node[2] = (f"{int_to_ip(network)}/{prefix}", metadata)
+
+    def lookup(self, ip):
+        """Return (cidr, metadata) of the longest matching prefix, or None"""
+        if isinstance(ip, str):
+            ip = ip_to_int(ip)
+        elif not 0 <= ip <= 0xFFFFFFFF:
+            # -1 would otherwise walk the trie as 255.255.255.255
+            raise ValueError(f"IPv4 address out of range: {ip}")
+        node = self.root
+        best = node[2]
+        shift = 31
+        while shift >= 0:
+            node = node[(ip >> shift) & 1]
+            if node is None:
+                break
+            if node[2] is not None:
+                best = node[2]
+            shift -= 1
+        return best
+
+    def classify_many(self, addresses):
+        """Look up many addresses (strings or integers, e.g. a packed array)"""
+        lookup = self.lookup
+        return [lookup(int(ip) if not isinstance(ip, str) else ip) for ip in addresses]
+
+    def __len__(self):
+        return self.count
 
 # Private IP ranges
+PRIVATE_NETWORKS = PrefixTrie()
+PRIVATE_NETWORKS.insert("10.0.0.0/8", "RFC1918")
+PRIVATE_NETWORKS.insert("172.16.0.0/12", "RFC1918")
+PRIVATE_NETWORKS.insert("192.168.0.0/16", "RFC1918")
+
 def is_private_ip(ip):
-    first_octet = int(ip.split(".")[0])
-    second_octet = int(ip.split(".")[1])
-
-    # 10.0.0.0/8
-    if first_octet == 10:
-        return True
-    # 172.16.0.0/12
-    if first_octet == 172 and 16 <= second_octet <= 31:
-        return True
-    # 192.168.0.0/16
-    if first_octet == 192 and second_octet == 168:
-        return True
-    return False
+    return PRIVATE_NETWORKS.lookup(ip) is not None
 
 assert is_private_ip("192.168.1.1") == True, "Fix this: is this a private IP?"
 assert is_private_ip("8.8.8.8") == False, "Fix this: is this a private IP?"
 assert is_private_ip("10.0.0.1") == True, "Fix this: is this a private IP?"
 assert is_private_ip("172.16.0.1") == True, "Fix this: is this a private IP?"
+assert is_private_ip("172.32.0.1") == False, "Fix this: is this a private IP?"
+
+try:
+    PRIVATE_NETWORKS.insert("10.0.0.0/-1", "RFC1918")
+    bad_prefix_stored = True
+except ValueError:
+    bad_prefix_stored = False
+assert bad_prefix_stored == False, "Fix this: can a /-1 be stored in the trie?"
+assert len(PRIVATE_NETWORKS) == 3, "Fix this: how many private ranges are stored?"
+assert is_private_ip("8.8.8.8") == False, "Fix this: did the bad prefix become a default route?"
+for bad_address in (-1, 2 ** 32):
+    try:
+        PRIVATE_NETWORKS.lookup(bad_address)
+        rejected = False
+    except ValueError:
+        rejected = True
+    assert rejected == True, f"Fix this: is {bad_address} an IPv4 address?"
+
+# Classify addresses against your own prefix list
+address_plan = PrefixTrie()
+address_plan.insert("10.0.0.0/8", {"name": "Private", "action": "permit"})
+address_plan.insert("10.20.0.0/16", {"name": "Customer A", "action": "permit"})
+address_plan.insert("10.20.99.0/24", {"name": "Quarantine", "action": "deny"})
+address_plan.insert("0.0.0.0/0", {"name": "Internet", "action": "inspect"})
+assert len(address_plan) == 4, "Fix this: how many prefixes are stored?"
+
+cidr, info = address_plan.lookup("10.20.99.5")
+assert cidr == "10.20.99.0/24", "Fix this: which prefix is the longest match?"
+assert info["action"] == "deny", "Fix this: what happens to traffic from 10.20.99.5?"
+
+matches = address_plan.classify_many(["10.20.1.1", "10.1.1.1", "8.8.8.8", ip_to_int("10.20.99.1")])
+names = [info["name"] for cidr, info in matches]
+assert names == ["Customer A", "Private", "Internet", "Quarantine"], "Fix this: how is each address classified?"
 
 # Generate IP range
-def generate_ip_range(base_ip, count):
-    """Generate a list of IPs starting from base_ip"""
-    parts = base_ip.split(".")
-    ips = []
-    start = int(parts[3])
+# A /8 holds 16 million addresses - far too many strings to keep in a list.
+# IPRange works like Python's range(): it only stores integers and creates
+# the dotted strings when you ask for them. Counting on integers also makes
+# 192.168.1.255 + 1 carry over into 192.168.2.0.
+OCTET_TEXT = [str(n) for n in range(256)]
+
+def format_ips(numbers):
+    """Format many integer addresses as dotted strings"""
+    text = OCTET_TEXT
+    return [f"{text[n >> 24]}.{text[(n >> 16) & 255]}.{text[(n >> 8) & 255]}.{text[n & 255]}" for n in numbers]
 
-    for i in range(count):
-        new_ip = f"{parts[0]}.{parts[1]}.{parts[2]}.{start + i}"
-        ips.append(new_ip)
-    return ips
+class IPRange:
+    """Lazy range of IPv4 addresses supporting len(), indexing, slicing and "in" """
+
+    def __init__(self, start, stop, step=1):
+        if isinstance(start, str):
+            start = ip_to_int(start)
+        if isinstance(stop, str):
+            stop = ip_to_int(stop)
+        self.numbers = range(start, stop, step)
+        if self.numbers and not (0 <= min(self.numbers[0], self.numbers[-1])
+                                 and max(self.numbers[0], self.numbers[-1]) <= 0xFFFFFFFF):
+            raise ValueError("IP range goes outside 0.0.0.0 - 255.255.255.255")
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            sliced = self.numbers[index]
+            return IPRange(sliced.start, sliced.stop, sliced.step)
+        return int_to_ip(self.numbers[index])
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            yield from chunk
+
+    def __contains__(self, ip):
+        if isinstance(ip, str):
+            if not is_valid_ip(ip):
+                return False
+            ip = ip_to_int(ip)
+        return ip in self.numbers
+
+    def chunks(self, size=256):
+        """Yield the addresses as lists of at most size strings"""
+        numbers = self.numbers
+        if numbers.step != 1:
+            for i in range(0, len(numbers), size):
+                yield format_ips(numbers[i:i + size])
+            return
+
+        # Step 1: inside a /24 only the last octet changes, so the first
+        # three octets are formatted once per block
+        text = OCTET_TEXT
+        for i in range(0, len(numbers), size):
+            chunk = []
+            block = numbers[i:i + size]
+            position = block.start
+            while position < block.stop:
+                block_end = min(block.stop, (position | 255) + 1)
+                prefix = f"{text[position >> 24]}.{text[(position >> 16) & 255]}.{text[(position >> 8) & 255]}."
+                chunk.extend([prefix + text[n & 255] for n in range(position, block_end)])
+                position = block_end
+            yield chunk
+
+    def __repr__(self):
+        if not self.numbers:
+            return "IPRange(empty)"
+        return f"IPRange({self[0]} - {self[-1]}, step {self.numbers.step})"
+
+def generate_ip_range(base_ip, count):
+    """Generate count IPs starting from base_ip (lazily)"""
+    start = ip_to_int(base_ip)
+    return IPRange(start, start + count)
 
 ip_range = generate_ip_range("192.168.1.10", 5)
 assert len(ip_range) == 5 , "Fix this: how many IPs generated?"
 assert ip_range[0] == "192.168.1.10" , "Fix this: what is the first IP?"
 assert ip_range[4] == "192.168.1.14", "Fix this: what is the last IP?"
 
+# The last octet carries over into the third one
+carry_range = generate_ip_range("192.168.1.250", 10)
+assert carry_range[-1] == "192.168.2.3", "Fix this: what comes 9 addresses after 192.168.1.250?"
+assert "192.168.1.260" not in carry_range, "Fix this: is 192.168.1.260 a real address?"
+assert "192.168.2.0" in carry_range, "Fix this: is 192.168.2.0 in the range?"
+assert list(carry_range[4:8]) == ["192.168.1.254", "192.168.1.255", "192.168.2.0", "192.168.2.1"], "Fix this: what is in the slice?"
+
+# Huge ranges cost no memory until you use them
+whole_ten = IPRange("10.0.0.0", ip_to_int("10.255.255.255") + 1)
+assert len(whole_ten) == 16777216, "Fix this: how many addresses in a /8?"
+assert whole_ten[2 ** 16] == "10.1.0.0", "Fix this: what is address number 65536?"
+every_64th = IPRange("10.0.0.0", "10.0.1.0", 64)
+assert list(every_64th) == ["10.0.0.0", "10.0.0.64", "10.0.0.128", "10.0.0.192"], "Fix this: what does a step of 64 give?"
+
+first_chunks = []
+for chunk in IPRange("10.0.0.250", "10.0.1.10").chunks(size=8):
+    first_chunks.append(chunk)
+assert [len(c) for c in first_chunks] == [8, 8], "Fix this: how big are the chunks?"
+assert first_chunks[0][6] == "10.0.1.0", "Fix this: which address is 6 after 10.0.0.250?"
+
 # MAC address validation
+HEX_DIGITS = "0123456789abcdefABCDEF"
+
 def is_valid_mac(mac):
     """Check if MAC address format is valid (XX:XX:XX:XX:XX:XX)"""
     parts = mac.split(":")
@@ -110,10 +384,288 @@ def is_valid_mac(mac):
     for part in parts:
         if len(part) != 2:
             return False
+        if part[0] not in HEX_DIGITS or part[1] not in HEX_DIGITS:
+            return False
     return True
 
 assert is_valid_mac("00:1A:2B:3C:4D:5E") == True, "Fix this: is this a valid MAC?"
 assert is_valid_mac("00:1A:2B:3C:4D") == False, "Fix this: is this a valid MAC?"
+assert is_valid_mac("ZZ:ZZ:ZZ:ZZ:ZZ:ZZ") == False, "Fix this: is this a valid MAC?"
+
+# MAC addresses in bulk
+# ARP and CAM tables mix formats: 00:1a:2b:3c:4d:5e, 00-1A-2B-3C-4D-5E and
+# Cisco's 001a.2b3c.4d5e. Parsing them all into 48-bit integers makes them
+# comparable, and an array("Q") stores each one in 8 bytes.
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+def parse_mac(text):
+    """Return the MAC address as a 48-bit integer, or None if it is invalid"""
+    if len(text) == 17 and text[2] in ":-" and text[2::3] == text[2] * 5:
+        digits = text.replace(text[2], "")
+    elif len(text) == 14 and text[4::5] == "..":
+        digits = text.replace(".", "")
+    elif len(text) == 12:
+        digits = text
+    else:
+        return None
+    # int(x, 16) also accepts "+", "_" and spaces, so check the digits first
+    if len(digits) != 12 or digits.strip(HEX_DIGITS):
+        return None
+    return int(digits, 16)
+
+def format_mac(value, style="colon"):
+    """Format a 48-bit MAC address as colon, dash or cisco notation"""
+    digits = f"{value:012X}"
+    if style == "cisco":
+        digits = digits.lower()
+        return f"{digits[0:4]}.{digits[4:8]}.{digits[8:12]}"
+    separator = "-" if style == "dash" else ":"
+    return separator.join(digits[i:i + 2] for i in range(0, 12, 2))
+
+class MacTable:
+    """Compact table of MAC addresses stored as 48-bit integers"""
+
+    def __init__(self, macs=()):
+        self.macs = array("Q")
+        self._sorted = None  # sorted copy of macs for "in", built on the first lookup
+        self.oui_counts = Counter()  # vendor prefix (OUI = first 24 bits) -> addresses
+        self.invalid = []  # (position, text) of entries that could not be parsed
+        self.add_many(macs)
+
+    def add_many(self, texts):
+        """Parse and add many MAC addresses (strings or 48-bit integers); returns how many were valid"""
+        macs = self.macs
+        before = len(macs)
+        start = before + len(self.invalid)
+        for position, text in enumerate(texts, start):
+            if isinstance(text, str):
+                value = parse_mac(text)
+            else:
+                value = text if isinstance(text, int) and 0 <= text < 1 << 48 else None
+            if value is None:
+                self.invalid.append((position, text))
+            else:
+                macs.append(value)
+        # Update the indexes once per batch rather than once per address
+        added = macs[before:]
+        if added:
+            self._sorted = None
+        self.oui_counts.update(mac >> 24 for mac in added)
+        return len(added)
+
+    def add(self, text):
+        return self.add_many([text]) == 1
+
+    def __len__(self):
+        return len(self.macs)
+
+    def __iter__(self):
+        return iter(self.macs)
+
+    def __contains__(self, mac):
+        value = parse_mac(mac) if isinstance(mac, str) else mac
+        if value is None:
+            return False
+        # A binary search in a sorted array("Q") keeps the table at 8 bytes
+        # per address (16 with the copy) instead of a set's ~40 more
+        if self._sorted is None:
+            self._sorted = array("Q", sorted(self.macs))
+        position = bisect_left(self._sorted, value)
+        return position < len(self._sorted) and self._sorted[position] == value
+
+    def unique(self):
+        """New table without duplicates, keeping the first-seen order"""
+        return MacTable(dict.fromkeys(self.macs))
+
+    def count_by_oui(self):
+        """How many addresses per vendor prefix"""
+        return dict(self.oui_counts)
+
+    def vendors(self, oui_database):
+        """Vendor name for every address; oui_database maps OUI integers to names"""
+        # One database lookup per vendor prefix instead of one per address
+        names = {oui: oui_database.get(oui, "Unknown") for oui in self.oui_counts}
+        return [names[mac >> 24] for mac in self.macs]
+
+cam_table = MacTable([
+    "00:1A:2B:3C:4D:5E",   # colon
+    "00-1a-2b-3c-4d-5f",   # dash, lower case
+    "001a.2b3c.4d5e",      # Cisco - same address as the first one
+    "F4:CE:46:00:00:01",
+    "ZZ:ZZ:ZZ:ZZ:ZZ:ZZ",   # not hex
+    "00:1A:2B:3C:4D",      # too short
+])
+assert len(cam_table) == 4, "Fix this: how many valid MAC addresses?"
+assert [position for position, text in cam_table.invalid] == [4, 5], "Fix this: which entries were invalid?"
+assert format_mac(cam_table.macs[1]) == "00:1A:2B:3C:4D:5F", "Fix this: how is the dash MAC normalized?"
+assert format_mac(cam_table.macs[0], "cisco") == "001a.2b3c.4d5e", "Fix this: what is the Cisco format?"
+assert "00-1A-2B-3C-4D-5E" in cam_table, "Fix this: is this MAC in the table?"
+
+unique_macs = cam_table.unique()
+assert len(unique_macs) == 3, "Fix this: how many unique MAC addresses?"
+
+oui_database = {parse_mac("00:1A:2B:00:00:00") >> 24: "Ayecom", parse_mac("F4:CE:46:00:00:00") >> 24: "HP"}
+assert unique_macs.vendors(oui_database) == ["Ayecom", "Ayecom", "HP"], "Fix this: which vendors made these devices?"
+assert unique_macs.count_by_oui()[0x001A2B] == 2, "Fix this: how many Ayecom addresses?"
+assert cam_table.oui_counts[0xF4CE46] == 1, "Fix this: how many HP addresses are in the CAM table?"
+assert cam_table.oui_counts[0x000000] == 0, "Fix this: how many addresses have an unknown prefix?"
+assert 0x001A2B3C4D5F in cam_table, "Fix this: can you look up an integer MAC?"
+
+# Batch IP validation
+# Flow exports contain millions of addresses. Checking them one by one with
+# split() and int() is slow, so validate the whole batch in one go and store
+# every address as a packed 32-bit integer (4 bytes instead of a string).
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Every valid octet spelling ("7", "07", "007", ... "255") mapped to its value,
+# so checking an octet is one dictionary lookup instead of isdigit() + int()
+OCTET_VALUES = {}
+for value in range(256):
+    for width in range(len(str(value)), 4):
+        OCTET_VALUES[str(value).zfill(width)] = value
+OCTET_BYTE_VALUES = {text.encode("ascii"): value for text, value in OCTET_VALUES.items()}
+
+def parse_ip_buffer(data):
+    """
+    Vectorized (NumPy) parser for a bytes buffer with one address per line.
+
+    Instead of looping over the addresses, all bytes are classified at once
+    and only the positions of dots and newlines are looked at: every octet
+    ends at one of them, so its value can be read from the 1-3 digits just
+    before it.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if len(buf) and buf[-1] != 10:
+        buf = np.append(buf, np.uint8(10))
+
+    newline_at = np.flatnonzero(buf == 10)
+    lines = len(newline_at)
+    separator = (buf == 46) | (buf == 10)
+    separator_at = np.flatnonzero(separator)
+    is_digit = (buf - 48) < 10  # uint8 wraps around, so only "0".."9" are < 10
+
+    # A line is bad if it contains anything but digits, dots and the newline
+    bad_line = np.zeros(lines, dtype=bool)
+    bad_line[np.searchsorted(newline_at, np.flatnonzero(~(is_digit | separator)))] = True
+
+    # Each separator ends one octet: its length and value (the last 3 digits;
+    # longer octets like "0001" are fine as long as the extra digits are zeros)
+    length = np.diff(separator_at, prepend=-1) - 1
+    value = np.zeros(len(separator_at), dtype=np.uint32)
+    for back, weight in ((1, 1), (2, 10), (3, 100)):
+        # Clamp at the start of the buffer; digits before an octet's start are masked out below
+        digit = buf[np.maximum(separator_at - back, 0)].astype(np.uint32) - 48
+        value += np.where(length >= back, weight * digit, 0).astype(np.uint32)
+    # nonzero_before[i] = how many digits 1-9 come before position i
+    nonzero_before = np.concatenate(([0], np.cumsum((buf - 49) < 9)))
+    start = separator_at - length
+    extra_digits_zero = nonzero_before[np.maximum(separator_at - 3, start)] == nonzero_before[start]
+    octet_ok = (length >= 1) & extra_digits_zero & (value <= 255)
+
+    ends_line = buf[separator_at] == 10
+    octet_line = np.cumsum(ends_line) - ends_line
+    bad_line[octet_line[~octet_ok]] = True
+    dots = np.bincount(octet_line, minlength=lines) - 1
+    mask = ~bad_line & (dots == 3)
+
+    # The last octet of line i is the one ending at its newline
+    last = np.flatnonzero(ends_line)[mask]
+    packed = np.zeros(lines, dtype=np.uint32)
+    packed[mask] = (value[last - 3] << 24) | (value[last - 2] << 16) | (value[last - 1] << 8) | value[last]
+    return mask, packed
+
+def validate_ip_batch(addresses):
+    """
+    Validate many IPv4 addresses at once.
+
+    addresses can be a list (or NumPy array) of strings, or a bytes buffer
+    with one address per line. Returns (mask, packed): mask[i] tells if
+    address i is valid and packed[i] is the address as a 32-bit integer
+    (0 when invalid). With NumPy both are NumPy arrays, otherwise a list of
+    bools and an array("I").
+    """
+    is_buffer = isinstance(addresses, (bytes, bytearray, memoryview))
+
+    if np is not None:
+        if is_buffer:
+            # The same line endings as bytes.splitlines() below: \n, \r\n and \r
+            return parse_ip_buffer(bytes(addresses).replace(b"\r\n", b"\n").replace(b"\r", b"\n"))
+        try:
+            # Every address ends with exactly one newline, so an empty last
+            # address still gets its own line
+            text = "\n".join(addresses) + "\n" if len(addresses) else ""
+        except TypeError:
+            text = None
+        # An address containing a newline would shift every following line
+        if text is not None and text.count("\n") == len(addresses):
+            return parse_ip_buffer(text.encode("ascii", "replace"))
+
+    if is_buffer:
+        items = bytes(addresses).splitlines()
+        dot, octet_value = b".", OCTET_BYTE_VALUES.get
+    else:
+        items = addresses
+        dot, octet_value = ".", OCTET_VALUES.get
+
+    mask = []
+    packed = array("I")
+    for item in items:
+        try:
+            a, b, c, d = item.split(dot)
+            a, b, c, d = octet_value(a), octet_value(b), octet_value(c), octet_value(d)
+        except (ValueError, TypeError, AttributeError):
+            a = None
+        if a is None or b is None or c is None or d is None:
+            # The table only has octets of up to 3 digits; anything else gets
+            # the same answer as is_valid_ip
+            text = item.decode("ascii", "replace") if isinstance(item, bytes) else item
+            valid = isinstance(text, str) and is_valid_ip(text)
+            mask.append(valid)
+            packed.append(ip_to_int(text) if valid else 0)
+        else:
+            mask.append(True)
+            packed.append((a << 24) | (b << 16) | (c << 8) | d)
+    if np is not None:
+        return np.array(mask, dtype=bool), np.array(packed, dtype=np.uint32)
+    return mask, packed
+
+flow_ips = ["192.168.1.1", "256.1.1.1", "10.0.0", "1.2.3.a", " 1.2.3.4", "+1.2.3.4", "1..3.4", "10.0.0.1"]
+mask, packed = validate_ip_batch(flow_ips)
+assert list(mask) == [True, False, False, False, False, False, False, True], "Fix this: which addresses are valid?"
+assert int(packed[0]) == 0xC0A80101, "Fix this: what is 192.168.1.1 as an integer?"
+assert int(packed[1]) == 0, "Fix this: what is stored for an invalid address?"
+assert list(mask) == [is_valid_ip(ip) for ip in flow_ips], "Fix this: batch and single validation should agree"
+
+mask, packed = validate_ip_batch(b"10.0.0.1\n999.0.0.1\n172.16.0.1\n")
+assert list(mask) == [True, False, True], "Fix this: which lines in the buffer are valid?"
+assert int(packed[2]) == (172 << 24) + (16 << 16) + 1, "Fix this: what is 172.16.0.1 as an integer?"
+
+mask, packed = validate_ip_batch(["1.2.3.4\n5.6.7.8", None, "0.0.0.0", "255.255.255.255", "1.2.3.1000", "1.2.3.4."])
+assert list(mask) == [False, False, True, True, False, False], "Fix this: which odd inputs are valid?"
+assert int(packed[3]) == 0xFFFFFFFF, "Fix this: what is 255.255.255.255 as an integer?"
+
+# Every input gets exactly one result, even empty strings at the end
+for batch in [["1.2.3.4", ""], [""], [], ["", "", "10.0.0.1"]]:
+    mask, packed = validate_ip_batch(batch)
+    assert len(mask) == len(batch), "Fix this: how many results for this batch?"
+    assert len(packed) == len(batch), "Fix this: how many packed addresses for this batch?"
+    assert list(mask) == [is_valid_ip(ip) for ip in batch], "Fix this: batch and single validation should agree"
+assert type(validate_ip_batch([])) == type(validate_ip_batch([None])), "Fix this: should the result types depend on the input?"
+assert type(validate_ip_batch([])[1]) == type(validate_ip_batch(["1.2.3.4"])[1]), "Fix this: should the result types depend on the input?"
+
+# Extra leading zeros are allowed, like in is_valid_octet
+zero_padded = ["0001.1.1.1", "10.0.0.0255", "1.2.3.0256", "01.002.0003.4"]
+mask, packed = validate_ip_batch(zero_padded)
+assert list(mask) == [is_valid_ip(ip) for ip in zero_padded] == [True, True, False, True], "Fix this: which padded addresses are valid?"
+assert int(packed[1]) == ip_to_int("10.0.0.255"), "Fix this: what is 10.0.0.0255 as an integer?"
+
+# \r alone also ends a line, with or without NumPy
+assert len(validate_ip_batch(b"1.2.3.4\r5.6.7.8\n")[0]) == 2, "Fix this: how many lines are in the buffer?"
 
 print("✓ Network Koan 1 completed! You can validate and manipulate IP addresses.")
 
@@ -6,16 +6,202 @@ Runs all koan tests and shows progress
 
 import sys
 import os
+import io
+import time
+import struct
+import select
+import signal
+import marshal
+import hashlib
+import ast
+import csv
+import json
+import argparse
+import functools
+import builtins
+import itertools
+import tracemalloc
+import importlib.util
+import multiprocessing
+from collections import namedtuple
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
-def run_koan(koan_path):
-    """Run a single koan and return results"""
+try:
+    import resource
+except ImportError:  # Windows has no rlimits
+    resource = None
+
+KOAN_DIRS = ['basic_python', 'network_automation']
+CACHE_DIR = Path(__file__).resolve().parent / '.koan_cache'
+
+LEDGER_FILE = 'ledger.json'
+LEDGER_MAX_ENTRIES = 1000
+
+# Outcome of one koan; cached is True when it was taken from the ledger
+KoanResult = namedtuple(
+    'KoanResult',
+    ['koan_dir', 'koan_file', 'passed', 'message', 'output', 'elapsed', 'digest', 'cached', 'stats'],
+    defaults=[None]
+)
+
+# Per-koan limits; any limit that is set makes koans run in a supervised worker.
+# timeout is wall-clock seconds, max_memory is bytes, max_cpu is CPU seconds.
+KoanLimits = namedtuple('KoanLimits', ['timeout', 'max_memory', 'max_cpu'], defaults=[None, None, None])
+
+TIMED_OUT = "⏱ Timed out"
+
+# Supervised workers are started from pool threads with --jobs, and forking a
+# multi-threaded process can deadlock the child, so never use plain fork here
+SUPERVISOR_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+STAT_FIELDS = ['wall_time', 'cpu_time', 'peak_memory', 'assertions', 'import_time']
+
+# Bump when the way koans are compiled changes, to invalidate old disk entries
+CACHE_VERSION = 2
+
+# Name of the counter that instrumented koans call before every assert
+ASSERT_COUNTER = '__koan_assert__'
+
+# Compiled koans for this run: resolved path -> (mtime_ns, size, digest, code)
+_code_cache = {}
+
+# On-disk entry: magic, source mtime_ns, source size, sha256 digest, marshal data
+_CACHE_HEADER = struct.Struct('<4sqq32s')
+
+def _cache_file(cache_dir, source_path):
+    key = f"{CACHE_VERSION}:{source_path}"
+    name = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+    return Path(cache_dir) / f"{name}.koanc"
+
+def _read_code_cache(cache_dir, source_path):
+    """Return (mtime_ns, size, digest, code) from the disk cache, or None"""
     try:
-        with open(koan_path, 'r', encoding='utf-8') as f:
-            code = f.read()
+        data = _cache_file(cache_dir, source_path).read_bytes()
+        magic, mtime_ns, size, digest = _CACHE_HEADER.unpack_from(data)
+        if magic != importlib.util.MAGIC_NUMBER:
+            return None
+        code = marshal.loads(data[_CACHE_HEADER.size:])
+    except (OSError, ValueError, EOFError, TypeError, struct.error):
+        return None
+    return mtime_ns, size, digest.hex(), code
 
-        # Create a namespace for the koan
-        namespace = {}
+def _write_code_cache(cache_dir, source_path, mtime_ns, size, digest, code):
+    """Store a compiled koan on disk; the cache is best effort"""
+    target = _cache_file(cache_dir, source_path)
+    header = _CACHE_HEADER.pack(importlib.util.MAGIC_NUMBER, mtime_ns, size, bytes.fromhex(digest))
+    temp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp.write_bytes(header + marshal.dumps(code))
+        os.replace(temp, target)
+    except OSError:
+        pass
+
+class _AssertCounter(ast.NodeTransformer):
+    """Insert a call to the assert counter in front of every assert statement"""
+
+    def visit_Assert(self, node):
+        call = ast.Expr(ast.Call(ast.Name(ASSERT_COUNTER, ast.Load()), [], []))
+        return [ast.copy_location(call, node), node]
+
+def _compile_instrumented(source, filename):
+    tree = _AssertCounter().visit(ast.parse(source, filename))
+    return compile(ast.fix_missing_locations(tree), filename, 'exec')
+
+def compile_koan(koan_path, cache_dir=None):
+    """
+    Return (code, digest) for a koan, compiling it only when it changed.
+
+    Entries are checked by mtime and size first; when those differ the
+    source is re-read and its sha256 digest decides whether the old code
+    object can still be used. Compiled code is kept in memory for the
+    current run and, if cache_dir is given, marshalled to disk for later runs.
+    """
+    source_path = str(Path(koan_path).resolve())
+    stat = os.stat(source_path)
+
+    cached = _code_cache.get(source_path)
+    if cached is None and cache_dir is not None:
+        cached = _read_code_cache(cache_dir, source_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        _code_cache[source_path] = cached
+        return cached[3], cached[2]
+
+    with open(source_path, 'rb') as f:
+        source = f.read()
+    digest = hashlib.sha256(source).hexdigest()
+
+    if cached and cached[2] == digest:
+        code = cached[3]
+    else:
+        code = _compile_instrumented(source, str(koan_path))
+
+    _code_cache[source_path] = (stat.st_mtime_ns, stat.st_size, digest, code)
+    if cache_dir is not None:
+        _write_code_cache(cache_dir, source_path, stat.st_mtime_ns, stat.st_size, digest, code)
+    return code, digest
+
+def koan_digest(koan_path, cache_dir=None):
+    """Return the sha256 digest of a koan's source without compiling it"""
+    try:
+        source_path = str(Path(koan_path).resolve())
+        stat = os.stat(source_path)
+        cached = _code_cache.get(source_path)
+        if cached is None and cache_dir is not None:
+            cached = _read_code_cache(cache_dir, source_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        with open(source_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def _timed_builtins(stats):
+    """Builtins for a koan namespace whose __import__ adds to stats['import_time']"""
+    real_import = builtins.__import__
+
+    def timed_import(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return real_import(*args, **kwargs)
+        finally:
+            stats['import_time'] += time.perf_counter() - start
+
+    koan_builtins = dict(builtins.__dict__)
+    koan_builtins['__import__'] = timed_import
+    return koan_builtins
+
+def run_koan(koan_path, cache_dir=None, stats=None):
+    """
+    Run a single koan and return results
+
+    If a stats dict is given it is filled with wall_time, cpu_time (seconds),
+    peak_memory (bytes allocated, via tracemalloc), assertions (number of
+    assert statements executed) and import_time (seconds spent in imports).
+    """
+    assertions = itertools.count()
+    namespace = {ASSERT_COUNTER: assertions.__next__}
+
+    if stats is not None:
+        stats['import_time'] = 0.0
+        namespace['__builtins__'] = _timed_builtins(stats)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+    try:
+        code, _ = compile_koan(koan_path, cache_dir)
+
+        # Run the koan in its own namespace
         exec(code, namespace)
 
         return True, "✓ Passed"
@@ -23,50 +209,508 @@ def run_koan(koan_path):
         return False, f"✗ Failed: {str(e)}"
     except Exception as e:
         return False, f"✗ Error: {str(e)}"
+    finally:
+        if stats is not None:
+            stats['wall_time'] = time.perf_counter() - wall_start
+            stats['cpu_time'] = time.process_time() - cpu_start
+            stats['peak_memory'] = max(0, tracemalloc.get_traced_memory()[1] - memory_before)
+            if started_tracing:
+                tracemalloc.stop()
+            # The counter has been called once per assert; this is the next value
+            stats['assertions'] = next(assertions)
 
-def main():
-    print("=" * 60)
-    print("PYTHON KOANS - Network Technician Edition")
-    print("=" * 60)
-    print()
+def run_koan_captured(koan_path, cache_dir=None, collect_stats=False):
+    """
+    Run a koan with its output captured (used by worker processes)
 
-    # Find all koan files
-    koan_dirs = ['basic_python', 'network_automation']
-    all_passed = True
+    Returns (passed, message, output, elapsed, stats); stats is None
+    unless collect_stats is set.
+    """
+    buffer = io.StringIO()
+    stats = {} if collect_stats else None
+    start = time.perf_counter()
+    with redirect_stdout(buffer):
+        passed, message = run_koan(koan_path, cache_dir, stats)
+    elapsed = time.perf_counter() - start
+    return passed, message, buffer.getvalue(), elapsed, stats
+
+def _supervised_worker(conn, koan_path, cache_dir, collect_stats, limits):
+    """Entry point of the worker process started by run_koan_supervised"""
+    if resource is not None:
+        if limits.max_memory:
+            resource.setrlimit(resource.RLIMIT_AS, (limits.max_memory, limits.max_memory))
+        if limits.max_cpu:
+            seconds = max(1, int(limits.max_cpu))
+            resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds))
+    conn.send(run_koan_captured(koan_path, cache_dir, collect_stats))
+    conn.close()
+
+def run_koan_supervised(koan_path, cache_dir=None, collect_stats=False, limits=KoanLimits()):
+    """
+    Run a koan in its own worker process and enforce the given limits
+
+    The worker is killed when it exceeds limits.timeout, so a koan that
+    never finishes cannot stall the run. Memory and CPU limits are applied
+    with rlimits inside the worker where the platform supports them.
+    Returns the same tuple as run_koan_captured.
+    """
+    receiver, sender = SUPERVISOR_CONTEXT.Pipe(duplex=False)
+    worker = SUPERVISOR_CONTEXT.Process(
+        target=_supervised_worker,
+        args=(sender, koan_path, cache_dir, collect_stats, limits),
+        daemon=True
+    )
+    start = time.perf_counter()
+    worker.start()
+    sender.close()
+    try:
+        # poll() also returns when the worker dies, in which case recv() fails
+        if receiver.poll(limits.timeout):
+            try:
+                return receiver.recv()
+            except EOFError:
+                pass
+        else:
+            return False, f"{TIMED_OUT}: still running after {limits.timeout:g}s", "", time.perf_counter() - start, None
 
+        worker.join()
+        elapsed = time.perf_counter() - start
+        if resource is not None and worker.exitcode == -getattr(signal, 'SIGXCPU', 0):
+            return False, f"{TIMED_OUT}: used more than {limits.max_cpu:g}s of CPU time", "", elapsed, None
+        return False, f"✗ Error: koan worker exited with code {worker.exitcode}", "", elapsed, None
+    finally:
+        if worker.is_alive():
+            worker.kill()
+        worker.join()
+        receiver.close()
+
+def find_koan_files(koan_dirs):
+    """Return (koan_dir, koan_file) pairs in the order they should run"""
+    koan_files = []
     for koan_dir in koan_dirs:
         dir_path = Path(koan_dir)
         if not dir_path.exists():
             continue
+        for koan_file in sorted(dir_path.glob('*.py')):
+            koan_files.append((koan_dir, koan_file))
+    return koan_files
+
+def iter_koan_results(koan_files, jobs=1, cache_dir=None, ledger=None, collect_stats=False,
+                      limits=None):
+    """
+    Run koans and yield a KoanResult for each of them in the original order.
+
+    Koan output is captured and handed back for printing in order; with
+    jobs > 1 the koans run in a process pool. Closing the generator
+    (e.g. on the first failure) cancels all koans that have not started yet.
+
+    If a ledger is given, koans whose current source digest is recorded
+    there as passed are reported from the ledger without running.
+    With collect_stats, each result carries the stats from run_koan.
+    With limits (a KoanLimits), every koan runs in a supervised worker
+    process; with jobs > 1 a thread pool then drives the workers.
+    """
+    planned = []
+    for koan_dir, koan_file in koan_files:
+        digest = koan_digest(koan_file, cache_dir)
+        entry = ledger.get(digest) if ledger and digest else None
+        planned.append((koan_dir, koan_file, digest, entry if entry and entry['passed'] else None))
+
+    if limits:
+        run, executor_class = functools.partial(run_koan_supervised, limits=limits), ThreadPoolExecutor
+    else:
+        run, executor_class = run_koan_captured, ProcessPoolExecutor
+
+    if jobs <= 1:
+        for koan_dir, koan_file, digest, entry in planned:
+            if entry:
+                yield KoanResult(koan_dir, koan_file, True, "✓ Passed", None, entry['duration'], digest, True)
+                continue
+            passed, message, output, elapsed, stats = run(koan_file, cache_dir, collect_stats)
+            yield KoanResult(koan_dir, koan_file, passed, message, output, elapsed, digest, False, stats)
+        return
 
-        print(f"\n📁 {koan_dir.replace('_', ' ').title()}")
-        print("-" * 60)
+    executor = executor_class(max_workers=jobs)
+    futures = [
+        None if entry else executor.submit(run, koan_file, cache_dir, collect_stats)
+        for _, koan_file, _, entry in planned
+    ]
+    try:
+        for (koan_dir, koan_file, digest, entry), future in zip(planned, futures):
+            if entry:
+                yield KoanResult(koan_dir, koan_file, True, "✓ Passed", None, entry['duration'], digest, True)
+                continue
+            try:
+                passed, message, output, elapsed, stats = future.result()
+            except Exception as e:
+                passed, message, output, elapsed, stats = False, f"✗ Error: {str(e)}", "", 0.0, None
+            yield KoanResult(koan_dir, koan_file, passed, message, output, elapsed, digest, False, stats)
+    finally:
+        for future in futures:
+            if future is not None:
+                future.cancel()
+        executor.shutdown(wait=True)
+
+def load_ledger(cache_dir):
+    """Load the result ledger (digest -> last result) from the cache directory"""
+    try:
+        with open(Path(cache_dir) / LEDGER_FILE, 'r', encoding='utf-8') as f:
+            ledger = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return ledger if isinstance(ledger, dict) else {}
+
+def save_ledger(cache_dir, ledger):
+    """Write the ledger back, keeping only the most recently recorded entries"""
+    entries = list(ledger.items())[-LEDGER_MAX_ENTRIES:]
+    target = Path(cache_dir) / LEDGER_FILE
+    temp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(dict(entries), f, indent=1)
+        os.replace(temp, target)
+    except OSError:
+        pass
+
+def record_result(ledger, result):
+    """Remember the outcome of a koan that was actually run"""
+    if result.cached or not result.digest:
+        return
+    # Re-insert so the ledger stays ordered from oldest to newest
+    ledger.pop(result.digest, None)
+    ledger[result.digest] = {
+        'koan': str(result.koan_file),
+        'passed': result.passed,
+        'duration': round(result.elapsed, 6),
+    }
+
+def format_elapsed(result):
+    """Format a koan's wall time for the progress output"""
+    if result.cached:
+        return "(cached)"
+    return f"({result.elapsed * 1000:.1f} ms)"
 
-        koan_files = sorted(dir_path.glob('*.py'))
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Python koans in order.")
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help="number of koans to run in parallel worker processes "
+             "(0 = one per CPU, default: 1)"
+    )
+    parser.add_argument(
+        '--cache-dir', type=Path, default=CACHE_DIR,
+        help=f"where compiled koans are cached between runs (default: {CACHE_DIR.name})"
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="do not read or write the on-disk compile cache and result ledger"
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help="run every koan, even those that passed and have not changed since"
+    )
+    parser.add_argument(
+        '--timeout', type=float, metavar='SECONDS',
+        help="stop a koan that runs longer than SECONDS (runs koans in supervised workers)"
+    )
+    parser.add_argument(
+        '--max-memory', type=float, metavar='MB',
+        help="limit each koan's address space to MB megabytes (Unix only)"
+    )
+    parser.add_argument(
+        '--max-cpu', type=float, metavar='SECONDS',
+        help="limit each koan to SECONDS of CPU time (Unix only)"
+    )
+    parser.add_argument(
+        '--report', type=Path, metavar='FILE',
+        help="write per-koan timing, memory and assert counts to FILE (.json or .csv)"
+    )
+    parser.add_argument(
+        '--slowest', type=int, nargs='?', const=10, default=0, metavar='N',
+        help="print the N slowest koans (default N: 10)"
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="keep running and re-run koans as soon as they are saved"
+    )
+    parser.add_argument(
+        '--poll', action='store_true',
+        help="in watch mode, poll file mtimes instead of using inotify"
+    )
+    parser.add_argument(
+        '--interval', type=float, default=0.5,
+        help="polling interval in seconds for --watch (default: 0.5)"
+    )
+    return parser.parse_args(argv)
 
-        for koan_file in koan_files:
-            koan_name = koan_file.stem.replace('_', ' ').title()
-            passed, message = run_koan(koan_file)
+def print_result(result):
+    """Print the progress line(s) for one koan result"""
+    if result.output:
+        sys.stdout.write(result.output)
+
+    koan_name = result.koan_file.stem.replace('_', ' ').title()
+
+    if result.passed:
+        print(f"  {result.message} {koan_name} {format_elapsed(result)}")
+    else:
+        print(f"  {result.message}")
+        print(f"  File: {result.koan_file} {format_elapsed(result)}")
+
+def run_all(koan_files, jobs=1, cache_dir=None, ledger=None, force=False, collect_stats=False,
+            limits=None):
+    """
+    Run all koans in order, stopping at the first failure
+
+    Returns (exit_code, results) where results are the KoanResults reported.
+    """
+    current_dir = None
+    skip_ledger = None if force else ledger
+    reported = []
+
+    results = iter_koan_results(koan_files, jobs, cache_dir, skip_ledger, collect_stats, limits)
+    try:
+        for result in results:
+            reported.append(result)
+            if ledger is not None:
+                record_result(ledger, result)
 
-            if passed:
-                print(f"  {message} {koan_name}")
-            else:
-                print(f"  {message}")
-                print(f"  File: {koan_file}")
-                all_passed = False
+            if result.koan_dir != current_dir:
+                current_dir = result.koan_dir
+                print(f"\n📁 {current_dir.replace('_', ' ').title()}")
+                print("-" * 60)
+
+            print_result(result)
+
+            if not result.passed:
                 # Stop at first failure
                 print("\n" + "=" * 60)
                 print("Fix the failing koan above, then run again!")
                 print("=" * 60)
-                return 1
+                return 1, reported
+    finally:
+        results.close()
+        if ledger is not None:
+            save_ledger(cache_dir, ledger)
+
+    print("\n" + "=" * 60)
+    print("🎉 CONGRATULATIONS! All koans completed!")
+    print("=" * 60)
+    return 0, reported
+
+def report_row(result):
+    """Flatten a KoanResult into a dict for the JSON/CSV report"""
+    if result.cached:
+        status = 'cached'
+    elif result.message.startswith(TIMED_OUT):
+        status = 'timed out'
+    else:
+        status = 'passed' if result.passed else 'failed'
+    row = {'koan': str(result.koan_file), 'status': status}
+    stats = result.stats or {}
+    for field in STAT_FIELDS:
+        row[field] = stats.get(field)
+    if row['wall_time'] is None:
+        row['wall_time'] = result.elapsed
+    return row
+
+def write_report(results, report_path):
+    """Write per-koan stats as JSON or CSV, depending on the file suffix"""
+    rows = [report_row(result) for result in results]
+    report_path = Path(report_path)
+    with open(report_path, 'w', encoding='utf-8', newline='') as f:
+        if report_path.suffix.lower() == '.csv':
+            writer = csv.DictWriter(f, fieldnames=['koan', 'status'] + STAT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, f, indent=2)
+
+def print_slowest(results, count=10):
+    """Print the koans that took the most wall time"""
+    measured = sorted(
+        (result for result in results if result.stats),
+        key=lambda result: result.stats['wall_time'],
+        reverse=True
+    )[:count]
+
+    print(f"\n⏱  Slowest koans")
+    print("-" * 60)
+    print(f"  {'Koan':30} {'Wall ms':>8} {'CPU ms':>8} {'Peak KiB':>9} {'Asserts':>7}")
+    for result in measured:
+        stats = result.stats
+        print(
+            f"  {result.koan_file.stem[:30]:30} {stats['wall_time'] * 1000:8.1f} "
+            f"{stats['cpu_time'] * 1000:8.1f} {stats['peak_memory'] / 1024:9.1f} "
+            f"{stats['assertions']:7}"
+        )
+
+class PollingWatcher:
+    """Detect changed koans by comparing file mtimes at a fixed interval"""
+
+    def __init__(self, koan_dirs, interval=0.5):
+        self.koan_dirs = koan_dirs
+        self.interval = interval
+        self._mtimes = self._scan()
+
+    def _scan(self):
+        mtimes = {}
+        for _, koan_file in find_koan_files(self.koan_dirs):
+            try:
+                mtimes[koan_file] = koan_file.stat().st_mtime_ns
+            except OSError:
+                pass
+        return mtimes
+
+    def wait(self):
+        """Block until at least one koan changed and return the changed paths"""
+        while True:
+            time.sleep(self.interval)
+            current = self._scan()
+            changed = {path for path, mtime in current.items() if self._mtimes.get(path) != mtime}
+            self._mtimes = current
+            if changed:
+                return changed
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """Detect changed koans with Linux inotify (through ctypes, no extra packages)"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, koan_dirs, settle=0.05):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.settle = settle
+        self._fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # Editors often save via a temporary file and rename, so watch both
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+        self._dirs = {}
+        for koan_dir in koan_dirs:
+            if not Path(koan_dir).is_dir():
+                continue
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(koan_dir), mask)
+            if wd < 0:
+                self.close()
+                raise OSError(ctypes.get_errno(), f"cannot watch {koan_dir}")
+            self._dirs[wd] = Path(koan_dir)
+
+    def _read_events(self):
+        changed = set()
+        data = os.read(self._fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, _, _, name_len = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += name_len
+            if wd in self._dirs and name.endswith('.py'):
+                changed.add(self._dirs[wd] / name)
+        return changed
+
+    def wait(self):
+        """Block until at least one koan changed and return the changed paths"""
+        while True:
+            select.select([self._fd], [], [])
+            changed = self._read_events()
+            # Collect the burst of events a single save usually produces
+            while select.select([self._fd], [], [], self.settle)[0]:
+                changed |= self._read_events()
+            if changed:
+                return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+def create_watcher(koan_dirs, interval=0.5, polling=False):
+    """Use inotify where available and fall back to mtime polling"""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(koan_dirs)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(koan_dirs, interval)
+
+def watch_koans(watcher, koan_dirs, cache_dir=None, ledger=None, limits=None):
+    """
+    Re-run koans as they change, in this (already warm) interpreter.
+
+    Only the changed files are run; stops on Ctrl+C. With limits, each
+    koan runs in a supervised worker instead.
+    """
+    koan_dir_of = {Path(koan_dir): koan_dir for koan_dir in koan_dirs}
+    print(f"\n👀 Watching {', '.join(koan_dirs)} for changes (Ctrl+C to stop)...")
+    try:
+        while True:
+            for koan_file in sorted(watcher.wait()):
+                if not koan_file.exists():
+                    continue
+                output = None
+                if limits:
+                    passed, message, output, elapsed, _ = run_koan_supervised(koan_file, cache_dir, limits=limits)
+                else:
+                    start = time.perf_counter()
+                    passed, message = run_koan(koan_file, cache_dir)
+                    elapsed = time.perf_counter() - start
+                result = KoanResult(
+                    koan_dir_of.get(koan_file.parent, str(koan_file.parent)), koan_file,
+                    passed, message, output, elapsed, koan_digest(koan_file, cache_dir), False
+                )
+                print_result(result)
+                if ledger is not None:
+                    record_result(ledger, result)
+            if ledger is not None:
+                save_ledger(cache_dir, ledger)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.close()
+    return 0
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    print("=" * 60)
+    print("PYTHON KOANS - Network Technician Edition")
+    print("=" * 60)
+    print()
+
+    # Find all koan files
+    koan_files = find_koan_files(KOAN_DIRS)
+    ledger = load_ledger(cache_dir) if cache_dir is not None else None
+
+    collect_stats = bool(args.report or args.slowest)
+    limits = None
+    if args.timeout or args.max_memory or args.max_cpu:
+        max_memory = int(args.max_memory * 1024 * 1024) if args.max_memory else None
+        limits = KoanLimits(args.timeout, max_memory, args.max_cpu)
+
+    exit_code, results = run_all(koan_files, jobs, cache_dir, ledger, args.force, collect_stats, limits)
+
+    if args.slowest:
+        print_slowest(results, args.slowest)
+    if args.report:
+        write_report(results, args.report)
+        print(f"\n📄 Report written to {args.report}")
 
-    if all_passed:
-        print("\n" + "=" * 60)
-        print("🎉 CONGRATULATIONS! All koans completed!")
-        print("=" * 60)
-        return 0
+    if args.watch:
+        watcher = create_watcher(KOAN_DIRS, args.interval, args.poll)
+        exit_code = watch_koans(watcher, KOAN_DIRS, cache_dir, ledger, limits)
 
-    return 1
+    return exit_code
 
 if __name__ == "__main__":
     sys.exit(main())
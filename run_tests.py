@@ -4,7 +4,10 @@ Cross-platform test runner for Python Koans
 Runs all test suites and reports results
 """
 
+import os
 import sys
+import time
+import argparse
 import unittest
 from pathlib import Path
 
@@ -68,10 +71,65 @@ def run_specific_suite(suite_name):
     return 0 if result.wasSuccessful() else 1
 
 
+def run_backend_benchmark(repeat=3):
+    """Time every koan execution backend on all solved koans"""
+    from test_solved_koans import KOAN_BACKENDS, close_worker_pool
+
+    solved_dir = Path(__file__).parent / "tests" / "solved_koans"
+    koans = sorted(solved_dir.rglob("*.py"))
+
+    print("=" * 70)
+    print(f"Koan execution backends ({len(koans)} solved koans, best of {repeat})")
+    print("=" * 70)
+
+    timings = {}
+    try:
+        for name, run_koan in KOAN_BACKENDS.items():
+            # Warm-up pass, so e.g. the worker pool is already started
+            for koan in koans:
+                run_koan(koan)
+
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for koan in koans:
+                    run_koan(koan)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+    finally:
+        close_worker_pool()
+
+    baseline = timings["subprocess"]
+    for name, elapsed in timings.items():
+        print(f"  {name:12} {elapsed * 1000:9.1f} ms   {baseline / elapsed:5.1f}x")
+    print("=" * 70)
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Python Koans test suite.")
+    parser.add_argument(
+        "suite", nargs="?",
+        help="structure, runner, integration, or benchmark (default: all suites)"
+    )
+    parser.add_argument(
+        "--backend", choices=["subprocess", "inprocess", "pool"],
+        help="how the integration tests execute solved koans (default: subprocess)"
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    args = parse_args()
+    if args.backend:
+        os.environ["KOAN_TEST_BACKEND"] = args.backend
+
+    if args.suite == "benchmark":
+        exit_code = run_backend_benchmark()
+    elif args.suite:
         # Run specific suite
-        exit_code = run_specific_suite(sys.argv[1])
+        exit_code = run_specific_suite(args.suite)
     else:
         # Run all tests
         exit_code = run_all_tests()
@@ -17,6 +17,8 @@ assert len(devices) == 5, "Fix this: how many devices in inventory?"
 
 # Find device by hostname
 def find_device_by_hostname(inventory, hostname):
+    if hasattr(inventory, "find"):  # DeviceInventory (see below) has an index
+        return inventory.find(hostname)
     for device in inventory:
         if device["hostname"] == hostname:
             return device
@@ -28,6 +30,8 @@ assert core_switch["location"] == "Server Room", "Fix this: where is the core sw
 
 # Get all devices of a specific type
 def get_devices_by_type(inventory, device_type):
+    if hasattr(inventory, "select"):
+        return inventory.select("type", device_type)
     return [d for d in inventory if d["type"] == device_type]
 
 switches = get_devices_by_type(devices, "Switch")
@@ -38,6 +42,8 @@ assert len(routers) == 1, "Fix this: how many routers?"
 
 # Get devices in a location
 def get_devices_by_location(inventory, location):
+    if hasattr(inventory, "select"):
+        return inventory.select("location", location)
     result = []
     for device in inventory:
         if device["location"] == location:
@@ -49,6 +55,8 @@ assert len(server_room_devices) == 2, "Fix this: how many devices in Server Room
 
 # Count devices by type
 def count_devices_by_type(inventory):
+    if hasattr(inventory, "count_by"):
+        return inventory.count_by("type")
     counts = {}
     for device in inventory:
         device_type = device["type"]
@@ -64,18 +72,199 @@ assert device_counts["Router"] == 1, "Fix this: how many routers?"
 assert device_counts["Firewall"] == 1, "Fix this: how many firewalls?"
 
 # Generate device configuration template
-def generate_device_config(device):
-    config = f"""
-hostname {device['hostname']}
-interface Vlan{device['vlan']}
- ip address {device['ip']} 255.255.255.0
-!
-""".strip()
-    return config
+# A template is compiled once into a Python function (an f-string), so
+# rendering 20 000 devices does not parse the template 20 000 times.
+from string import Formatter
+
+class ConfigTemplate:
+    """
+    Config text with {field} placeholders, compiled once and rendered many
+    times. Fields come from the device, except for these derived ones:
+    ip without its prefix, prefix and mask (from "10.0.0.1/26", a "prefix"
+    field or /24), vlans as a comma separated list and interfaces rendered
+    with INTERFACE_TEMPLATE.
+    """
+
+    # Lines that compute the derived fields, added to the compiled function only
+    # if used, and the device fields each of them reads
+    DERIVED = [
+        (("ip", "prefix", "mask"), "ip, prefix = device_address(d) if 'prefix' in d or '/' in d['ip'] else (d['ip'], 24)",
+         ("ip", "prefix")),
+        (("mask",), "mask = SUBNET_MASKS[prefix]", ()),
+        (("vlans",), "vlans = vlan_list(d)", ("vlans", "vlan")),
+        (("interfaces",), "interfaces = interface_blocks(d)", ("interfaces",)),
+    ]
+    # Device fields that hold lists, which key() copies
+    LIST_FIELDS = ("vlans", "interfaces")
+
+    def __init__(self, text):
+        self.text = text
+        self.fields = []
+        derived = {name for names, line, reads in self.DERIVED for name in names}
+        source = []
+        for literal, field, format_spec, conversion in Formatter().parse(text):
+            source.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if not field.isidentifier() or "{" in format_spec or conversion not in (None, "r", "s", "a"):
+                raise ValueError(f"Unsupported template field: {{{field}}}")
+            value = field if field in derived else f"d[_{len(self.fields)}]"
+            conversion = "!" + conversion if conversion else ""
+            format_spec = ":" + format_spec if format_spec else ""
+            source.append(f"{{{value}{conversion}{format_spec}}}")
+            self.fields.append(field)
+        # render(device) is the compiled function. The field names are passed as
+        # default arguments (fast local variables), for example
+        # def render(d, _0='hostname', _1='vlan'):
+        #     ip, prefix = device_address(d) if ... else (d['ip'], 24)
+        #     return f'hostname {d[_0]}\ninterface Vlan{d[_1]}\n ip address {ip}'
+        arguments = "".join(f", _{number}={field!r}" for number, field in enumerate(self.fields))
+        lines = [f"def render(d{arguments}):"]
+        used = [(line, reads) for names, line, reads in self.DERIVED if set(names) & set(self.fields)]
+        lines += [f"    {line}" for line, reads in used]
+        lines.append(f"    return f{''.join(source)!r}")
+
+        # key(device) is a tuple of all device fields the config depends on, for
+        # example def key(d): return (d.get('hostname'), d.get('vlan'), d.get('ip'))
+        self.inputs = [field for field in self.fields if field not in derived]
+        for line, reads in used:
+            self.inputs += reads
+            if "interfaces" in reads:  # interface blocks fall back to the device fields
+                self.inputs += INTERFACE_TEMPLATE.inputs
+        self.inputs = list(dict.fromkeys(self.inputs))
+        values = [f"frozen(d.get({field!r}))" if field in self.LIST_FIELDS else f"d.get({field!r})"
+                  for field in self.inputs]
+        lines.append(f"def key(d): return ({', '.join(values)},)")
+
+        namespace = {}
+        try:
+            exec(compile("\n".join(lines), "<config template>", "exec"), globals(), namespace)
+        except SyntaxError as error:
+            raise ValueError(f"Invalid config template: {error.msg}") from None
+        self.render = namespace["render"]
+        self.key = namespace["key"]
+
+def prefix_to_mask(prefix):
+    mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+    return ".".join(str(mask >> shift & 255) for shift in (24, 16, 8, 0))
+
+SUBNET_MASKS = [prefix_to_mask(prefix) for prefix in range(33)]
+
+def device_address(device):
+    """IP address and prefix length of a device, from "10.0.0.1/26", a "prefix" field or /24"""
+    address, slash, prefix = device["ip"].partition("/")
+    prefix = int(prefix if slash else device.get("prefix", 24))  # "26" from a CSV file is fine
+    if not 0 <= prefix <= 32:
+        raise ValueError(f"Invalid prefix length for {device['hostname']}: /{prefix}")
+    return address, prefix
+
+def vlan_list(device):
+    return ",".join(map(str, device.get("vlans", [device["vlan"]])))
+
+def frozen(value):
+    """A copy of a list of values or dicts that does not change with it, for cache keys"""
+    if isinstance(value, list):
+        return [item.copy() if isinstance(item, dict) else item for item in value]
+    return value
+
+def interface_blocks(device):
+    render = INTERFACE_TEMPLATE.render
+    return "\n".join([render({**device, **interface}) for interface in device.get("interfaces", ())])
+
+DEVICE_TEMPLATE = ConfigTemplate("""hostname {hostname}
+interface Vlan{vlan}
+ ip address {ip} {mask}
+!""")
+
+INTERFACE_TEMPLATE = ConfigTemplate("""interface {name}
+ description {description}
+ switchport access vlan {vlan}
+!""")
+
+def generate_device_config(device, template=DEVICE_TEMPLATE):
+    return template.render(device)
+
+class ConfigRenderer:
+    """Renders configs for many devices and reuses them for devices that did not change"""
+
+    def __init__(self, template=DEVICE_TEMPLATE):
+        self.template = template
+        self.cache = {}  # hostname -> (template key, config)
+        self.rendered = 0
+        self.reused = 0
+
+    def render(self, device):
+        key = self.template.key(device)
+        cached = self.cache.get(device["hostname"])
+        if cached is not None and cached[0] == key:
+            self.reused += 1
+            return cached[1]
+        config = self.template.render(device)
+        self.cache[device["hostname"]] = (key, config)
+        self.rendered += 1
+        return config
+
+    def render_all(self, inventory):
+        """Configs for a whole inventory (or one batch of it), by hostname"""
+        return {device["hostname"]: self.render(device) for device in inventory}
 
 config = generate_device_config(devices[0])
 assert "hostname CORE-SW-01" in config, "Fix this: config should contain hostname"
 assert "10.0.0.1" in config, "Fix this: config should contain IP address"
+assert " ip address 10.0.0.1 255.255.255.0" in config, "Fix this: what mask does a device without a prefix get?"
+
+small_subnet = {"hostname": "LAB-SW-01", "ip": "10.0.9.1/26", "type": "Switch", "vlan": 90, "location": "Lab"}
+assert "10.0.9.1 255.255.255.192" in generate_device_config(small_subnet), "Fix this: what is the mask of a /26?"
+
+access_template = ConfigTemplate("""hostname {hostname}
+vlan {vlans}
+{interfaces}""")
+access_switch = dict(small_subnet, vlans=[90, 91], interfaces=[
+    {"name": "Gi0/1", "description": "Printer"},
+    {"name": "Gi0/2", "description": "Camera", "vlan": 91},
+])
+access_config = generate_device_config(access_switch, access_template)
+assert access_config.count("interface Gi0/") == 2, "Fix this: how many interface blocks?"
+assert "vlan 90,91" in access_config, "Fix this: which VLANs are created?"
+assert "switchport access vlan 91" in access_config, "Fix this: which VLAN is Gi0/2 in?"
+
+renderer = ConfigRenderer()
+configs = renderer.render_all(devices)
+assert configs["CORE-SW-01"] == config, "Fix this: is the rendered config the same?"
+renderer.render_all(devices)
+assert (renderer.rendered, renderer.reused) == (5, 5), "Fix this: how many configs were rendered and reused?"
+
+# The cache key holds only the fields the template uses, however the device was built
+key = DEVICE_TEMPLATE.key
+rebuilt = {field: devices[0][field] for field in reversed(list(devices[0]))}
+assert key(rebuilt) == key(devices[0]), "Fix this: do equal devices have the same key?"
+assert key(dict(devices[0], vlan=2)) != key(devices[0]), "Fix this: does a changed VLAN change the key?"
+assert key(dict(devices[0], location="Lab")) == key(devices[0]), "Fix this: is the location in the config?"
+
+access_renderer = ConfigRenderer(access_template)
+access_renderer.render(access_switch)
+access_switch["interfaces"][0]["description"] = "Scanner"
+assert "description Scanner" in access_renderer.render(access_switch), "Fix this: is the changed interface rendered again?"
+
+for bad_prefix in ("/-1", "/33"):
+    try:
+        generate_device_config(dict(small_subnet, ip="10.0.9.1" + bad_prefix))
+        prefix_rejected = False
+    except ValueError:
+        prefix_rejected = True
+    assert prefix_rejected == True, f"Fix this: is {bad_prefix} a valid prefix?"
+
+# A prefix field read from a CSV file is a string
+from_csv = dict(devices[0], prefix="26")
+assert " ip address 10.0.0.1 255.255.255.192" in generate_device_config(from_csv), "Fix this: what is the mask of prefix \"26\"?"
+
+for bad_template in ("hostname {hostname!z}", "hostname {hostname", "vlan {vlan:{width}}"):
+    try:
+        ConfigTemplate(bad_template)
+        template_rejected = False
+    except ValueError:
+        template_rejected = True
+    assert template_rejected == True, f"Fix this: is {bad_template!r} a valid template?"
 
 # Add new device to inventory
 def add_device(inventory, hostname, ip, device_type, vlan, location):
@@ -86,7 +275,10 @@ def add_device(inventory, hostname, ip, device_type, vlan, location):
         "vlan": vlan,
         "location": location
     }
-    inventory.append(new_device)
+    if hasattr(inventory, "add"):
+        inventory.add(new_device)
+    else:
+        inventory.append(new_device)
     return inventory
 
 # Add a new access switch
@@ -98,6 +290,8 @@ assert new_device["location"] == "Floor 3", "Fix this: what is the new device lo
 
 # Update device information
 def update_device_ip(inventory, hostname, new_ip):
+    if hasattr(inventory, "update"):
+        return inventory.update(hostname, ip=new_ip)
     device = find_device_by_hostname(inventory, hostname)
     if device:
         device["ip"] = new_ip
@@ -111,27 +305,143 @@ updated_device = find_device_by_hostname(devices, "ACC-SW-01")
 assert updated_device["ip"] == "10.0.2.10", "Fix this: what is the updated IP?"
 
 # Generate inventory report
-def generate_inventory_report(inventory):
-    report_lines = ["Network Device Inventory Report", "=" * 40]
+# The report is written to a file one row at a time. Column widths are
+# measured before writing, so a long hostname does not push the other
+# columns out of line.
+import heapq
+import io
+from itertools import chain, islice
+
+REPORT_COLUMNS = ("hostname", "ip", "type", "location")
+# The fixed widths the report always had; wider values widen the column
+REPORT_MIN_WIDTHS = {"hostname": 15, "ip": 15, "type": 10}
+
+def report_sort_key(column, value):
+    """Sort IP addresses by number (10.0.0.2 before 10.0.0.10), everything else as is"""
+    if column == "ip":  # one int per device is smaller than a tuple of four
+        a, b, c, d = map(int, value.partition("/")[0].split("."))
+        return a << 24 | b << 16 | c << 8 | d
+    return value
 
+def column_widths(inventory, columns=REPORT_COLUMNS):
+    """Widest value per column; indexed inventories only look at their distinct values"""
+    if hasattr(inventory, "distinct"):
+        return {column: max(map(len, map(str, inventory.distinct(column))), default=0)
+                for column in columns}
+    widths = dict.fromkeys(columns, 0)
     for device in inventory:
-        line = f"{device['hostname']:15} | {device['ip']:15} | {device['type']:10} | {device['location']}"
-        report_lines.append(line)
+        for column in columns:
+            widths[column] = max(widths[column], len(str(device[column])))
+    return widths
+
+def sorted_devices(inventory, column, limit=None):
+    """Devices ordered by column; with limit only the first `limit` of them are kept"""
+    if hasattr(inventory, "sorted_by"):
+        return inventory.sorted_by(column)
+    key = lambda device: report_sort_key(column, device[column])
+    if limit is not None:
+        return heapq.nsmallest(limit, inventory, key=key)  # stable, like sorted()
+    return sorted(inventory, key=key)
+
+def write_inventory_report(inventory, fileobj, columns=REPORT_COLUMNS,
+                           sort_by=None, page=None, page_size=50, sample=None):
+    """
+    Write the report to fileobj one row at a time and return the number of
+    rows. With sample, the widths are measured on the first `sample` rows
+    of the inventory only (longer values stick out but are not cut).
+    sort_by orders the rows by a column, and page (counting from 1) writes
+    only that page.
+    """
+    if page is not None and not hasattr(inventory, "__len__"):
+        inventory = list(inventory)  # a generator has to be counted for "page x of y"
+    rows = inventory
+    if sort_by:
+        rows = sorted_devices(inventory, sort_by, limit=None if page is None else page * page_size)
+    if page is not None:
+        start = (page - 1) * page_size
+        rows = islice(rows, start, start + page_size)
+    if hasattr(inventory, "distinct"):
+        widths = column_widths(inventory, columns)
+    elif hasattr(inventory, "__len__"):
+        # A list can be read twice: measure it first, then stream the rows
+        widths = column_widths(islice(inventory, sample), columns)
+    else:
+        # A generator can be read only once, so the measured rows are kept
+        rows = iter(rows)
+        head = list(islice(rows, sample))
+        widths = column_widths(head, columns)
+        rows = chain(head, rows)
 
-    return "\n".join(report_lines)
+    title = "Network Device Inventory Report"
+    if page is not None:
+        title += f" (page {page} of {max(1, -(-len(inventory) // page_size))})"
+    fileobj.write(f"{title}\n{'=' * 40}\n")
+    # The last column is not padded, so lines have no trailing spaces
+    widths = {column: max(width, REPORT_MIN_WIDTHS.get(column, 0)) for column, width in widths.items()}
+    line_format = " | ".join([f"{{:{widths[column]}}}" for column in columns[:-1]] + ["{}"]) + "\n"
+    count = 0
+    for device in rows:
+        fileobj.write(line_format.format(*[str(device[column]) for column in columns]))
+        count += 1
+    return count
+
+def generate_inventory_report(inventory, **options):
+    """The report as a string; takes the same options as write_inventory_report"""
+    buffer = io.StringIO()
+    write_inventory_report(inventory, buffer, **options)
+    return buffer.getvalue().rstrip("\n")
 
 report = generate_inventory_report(devices[:2])  # First 2 devices only
 lines = report.split("\n")
 assert len(lines) == 4, "Fix this: how many lines in report? (header + separator + 2 devices)"
 assert "CORE-SW-01" in report, "Fix this: report should contain CORE-SW-01"
 
+long_names = [dict(devices[0], hostname="CORE-DISTRIBUTION-SW-01"), devices[1]]
+long_lines = generate_inventory_report(long_names).split("\n")
+assert long_lines[2].index("|") == long_lines[3].index("|"), "Fix this: are the columns still aligned?"
+
+by_ip = generate_inventory_report(devices, sort_by="ip").split("\n")
+assert by_ip[2].startswith("CORE-SW-01"), "Fix this: which device has the lowest IP?"
+assert by_ip[-1].startswith("EDGE-RTR-01"), "Fix this: which device has the highest IP?"
+
+second_page = generate_inventory_report(devices, sort_by="hostname", page=2, page_size=4).split("\n")
+assert second_page[0].endswith("(page 2 of 2)"), "Fix this: what does the title say?"
+assert [line.split()[0] for line in second_page[2:]] == ["EDGE-RTR-01", "FW-01"], "Fix this: who is on page 2?"
+
+report_file = io.StringIO()
+assert write_inventory_report(devices, report_file) == 6, "Fix this: how many rows were written?"
+
+# Short values still get the classic fixed-width columns
+assert lines[2] == f"{'CORE-SW-01':15} | {'10.0.0.1':15} | {'Switch':10} | Server Room", "Fix this: what does a report line look like?"
+
+streamed = generate_inventory_report((device for device in devices), page=2, page_size=4).split("\n")
+assert streamed[0].endswith("(page 2 of 2)"), "Fix this: can a generator be paged?"
+assert len(streamed) == 4, "Fix this: how many lines are on page 2?"
+
 # Export to CSV format
-def export_to_csv(inventory):
-    csv_lines = ["hostname,ip,type,vlan,location"]
+# The csv module quotes fields that contain commas or quotes, and writing one
+# row at a time to a file means a huge inventory never has to fit in memory.
+import csv
+
+CSV_FIELDS = ["hostname", "ip", "type", "vlan", "location"]
+
+def export_to_csv(inventory, fileobj=None):
+    """
+    Write the inventory as CSV to fileobj (open it with newline="") and
+    return the number of devices. Without a fileobj the CSV is returned
+    as a string instead.
+    """
+    if fileobj is None:
+        buffer = io.StringIO()
+        export_to_csv(inventory, buffer)
+        return buffer.getvalue().rstrip("\n")
+    writer = csv.writer(fileobj, lineterminator="\n")
+    writer.writerow(CSV_FIELDS)
+    count = 0
     for device in inventory:
-        line = f"{device['hostname']},{device['ip']},{device['type']},{device['vlan']},{device['location']}"
-        csv_lines.append(line)
-    return "\n".join(csv_lines)
+        writer.writerow([device[field] for field in CSV_FIELDS])
+        count += 1
+    return count
 
 csv_output = export_to_csv(devices[:2])
 csv_rows = csv_output.split("\n")
@@ -139,23 +449,48 @@ assert len(csv_rows) == 3, "Fix this: how many CSV rows? (header + 2 devices)"
 assert csv_rows[0] == "hostname,ip,type,vlan,location", "Fix this: what is the CSV header?"
 
 # Parse CSV back to device list
+def iter_csv_devices(fileobj, bad_rows=None):
+    """
+    Read devices from CSV one row at a time. Columns are found by their
+    header name. Rows that cannot be parsed are skipped, and if bad_rows is
+    a list, (line number, reason) is appended to it for each of them.
+    """
+    def skip(reason):
+        if bad_rows is not None:
+            bad_rows.append((reader.line_num, reason))
+
+    reader = csv.reader(fileobj)
+    header = [name.strip() for name in next(reader, [])]
+    if not header:
+        return
+    missing = [field for field in CSV_FIELDS if field not in header]
+    if missing:
+        raise ValueError(f"CSV header is missing: {', '.join(missing)}")
+    columns = [header.index(field) for field in CSV_FIELDS]
+
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as error:  # e.g. a field larger than csv.field_size_limit()
+            skip(str(error))
+            continue
+        if not row:
+            continue  # blank line
+        if len(row) != len(header):
+            skip(f"expected {len(header)} fields, got {len(row)}")
+            continue
+        hostname, ip, device_type, vlan, location = (row[column] for column in columns)
+        try:
+            vlan = int(vlan)
+        except ValueError:
+            skip(f"VLAN is not a number: {vlan!r}")
+            continue
+        yield {"hostname": hostname, "ip": ip, "type": device_type, "vlan": vlan, "location": location}
+
 def parse_csv_to_devices(csv_string):
-    lines = csv_string.strip().split("\n")
-    headers = lines[0].split(",")
-    device_list = []
-
-    for line in lines[1:]:
-        values = line.split(",")
-        device = {
-            "hostname": values[0],
-            "ip": values[1],
-            "type": values[2],
-            "vlan": int(values[3]),
-            "location": values[4]
-        }
-        device_list.append(device)
-
-    return device_list
+    return list(iter_csv_devices(io.StringIO(csv_string)))
 
 csv_data = "hostname,ip,type,vlan,location\nTEST-SW-01,10.1.1.1,Switch,100,Test Lab"
 parsed = parse_csv_to_devices(csv_data)
@@ -163,4 +498,720 @@ assert len(parsed) == 1, "Fix this: how many devices parsed?"
 assert parsed[0]["hostname"] == "TEST-SW-01", "Fix this: what is the hostname?"
 assert parsed[0]["vlan"] == 100, "Fix this: what is the VLAN (as number)?"
 
+# Commas inside a field are quoted, so they survive the round trip
+office = [{"hostname": "AP-01", "ip": "10.0.3.1", "type": "Access Point", "vlan": 30, "location": "Floor 1, East"}]
+office_csv = export_to_csv(office)
+assert office_csv.split("\n")[1] == 'AP-01,10.0.3.1,Access Point,30,"Floor 1, East"', "Fix this: how is the location written?"
+assert parse_csv_to_devices(office_csv)[0]["location"] == "Floor 1, East", "Fix this: what is the location after parsing?"
+
+# Streaming through a file object; bad rows are reported, not fatal
+csv_file = io.StringIO()
+assert export_to_csv(devices, csv_file) == 6, "Fix this: how many devices were written?"
+csv_file.seek(0)
+assert [d["hostname"] for d in iter_csv_devices(csv_file)] == [d["hostname"] for d in devices], "Fix this: are all devices read back?"
+
+dump = io.StringIO("hostname,ip,type,vlan,location\n"
+                   "SW-1,10.9.0.1,Switch,10,Lab\n"
+                   "SW-2,10.9.0.2\n"
+                   "SW-3,10.9.0.3,Switch,ten,Lab\n"
+                   "SW-4,10.9.0.4,Switch,40,Lab\n")
+bad_rows = []
+loaded = list(iter_csv_devices(dump, bad_rows))
+assert len(loaded) == 2, "Fix this: how many rows were valid?"
+assert [line for line, reason in bad_rows] == [3, 4], "Fix this: on which lines are the bad rows?"
+
+# Indexed inventory
+# Every query above loops over the whole list, which is fine for 6 devices but
+# not for 50 000. DeviceInventory keeps dictionaries (hash indexes) next to the
+# devices so a lookup is one dictionary access. The indexes are updated on
+# every add, update and remove - change devices through the inventory, not
+# by editing the dictionaries directly, or the indexes get out of date.
+class DeviceInventory:
+    """Devices indexed by hostname and IP, and grouped by type, location and VLAN"""
+
+    GROUP_FIELDS = ("type", "location", "vlan")
+
+    def __init__(self, devices=()):
+        self.devices = {}  # hostname -> device, in the order they were added
+        self.order = {}    # hostname -> sequence number, to keep groups in that order
+        self.added = 0
+        self.by_ip = {}    # ip -> device
+        # field -> value -> {hostname: device}; an inner dict instead of a
+        # list so that removing a device from its group is O(1) as well
+        self.groups = {field: {} for field in self.GROUP_FIELDS}
+        for device in devices:
+            self.add(device)
+
+    def __len__(self):
+        return len(self.devices)
+
+    def __iter__(self):
+        return iter(self.devices.values())
+
+    def __contains__(self, hostname):
+        return hostname in self.devices
+
+    def _check_unique(self, device, existing=None):
+        other = self.devices.get(device["hostname"])
+        if other is not None and other is not existing:
+            raise ValueError(f"Duplicate hostname: {device['hostname']}")
+        other = self.by_ip.get(device["ip"])
+        if other is not None and other is not existing:
+            raise ValueError(f"Duplicate IP address: {device['ip']}")
+
+    def _group(self, device, field):
+        group = self.groups[field].setdefault(device[field], {})
+        group[device["hostname"]] = device
+        if len(group) > 1:
+            # An updated device lands at the end of its new group; if it was
+            # added before the member in front of it, restore inventory order
+            order = self.order
+            members = reversed(group)
+            next(members)
+            if order[next(members)] > order[device["hostname"]]:
+                ordered = sorted(group.items(), key=lambda member: order[member[0]])
+                group.clear()
+                group.update(ordered)
+
+    def _ungroup(self, device, field):
+        groups = self.groups[field]
+        group = groups[device[field]]
+        del group[device["hostname"]]
+        if not group:
+            del groups[device[field]]
+
+    def add(self, device):
+        """Add a device; hostname and IP must not be in use already"""
+        self._check_unique(device)
+        self.devices[device["hostname"]] = device
+        self.order[device["hostname"]] = self.added
+        self.added += 1
+        self.by_ip[device["ip"]] = device
+        for field in self.GROUP_FIELDS:
+            self._group(device, field)
+        return device
+
+    def remove(self, hostname):
+        """Remove and return the device, or None if there is no such device"""
+        device = self.devices.pop(hostname, None)
+        if device is not None:
+            del self.order[hostname]
+            del self.by_ip[device["ip"]]
+            for field in self.GROUP_FIELDS:
+                self._ungroup(device, field)
+        return device
+
+    def update(self, hostname, /, **changes):
+        """Change fields of a device, e.g. update("FW-01", ip="10.0.0.9") or update("FW-01", hostname="FW-02")"""
+        device = self.devices.get(hostname)
+        if device is None:
+            return False
+        changes = {field: value for field, value in changes.items() if device.get(field) != value}
+        self._check_unique({**device, **changes}, existing=device)
+
+        renamed = "hostname" in changes
+        regroup = self.GROUP_FIELDS if renamed else [f for f in self.GROUP_FIELDS if f in changes]
+        for field in regroup:
+            self._ungroup(device, field)
+        if "ip" in changes:
+            del self.by_ip[device["ip"]]
+        device.update(changes)
+        if "ip" in changes:
+            self.by_ip[device["ip"]] = device
+        if renamed:
+            # Rebuild to keep the device in its place; renames are rare
+            self.devices = {device["hostname"] if name == hostname else name: other
+                            for name, other in self.devices.items()}
+            self.order[device["hostname"]] = self.order.pop(hostname)
+        for field in regroup:
+            self._group(device, field)
+        return True
+
+    def find(self, hostname):
+        return self.devices.get(hostname)
+
+    def find_by_ip(self, ip):
+        return self.by_ip.get(ip)
+
+    def select(self, field, value):
+        """All devices where device[field] == value (field is type, location or vlan)"""
+        return list(self.groups[field].get(value, {}).values())
+
+    def count_by(self, field):
+        return {value: len(group) for value, group in self.groups[field].items()}
+
+    def distinct(self, field):
+        if field == "hostname":
+            return self.devices.keys()
+        if field == "ip":
+            return self.by_ip.keys()
+        return self.groups[field].keys()
+
+    def sorted_by(self, field):
+        """Devices ordered by a field, using the indexes (only the keys are sorted)"""
+        if field in self.groups:
+            groups = self.groups[field]
+            for value in sorted(groups):
+                yield from groups[value].values()
+        else:
+            index = self.by_ip if field == "ip" else self.devices
+            for key in sorted(index, key=lambda key: report_sort_key(field, key)):
+                yield index[key]
+
+# Remove a device (works for both a list and a DeviceInventory)
+def remove_device(inventory, hostname):
+    if hasattr(inventory, "remove"):
+        return inventory.remove(hostname) is not None
+    for position, device in enumerate(inventory):
+        if device["hostname"] == hostname:
+            del inventory[position]
+            return True
+    return False
+
+# Copies, so that changes below do not affect the devices list
+inventory = DeviceInventory(dict(device) for device in devices)
+assert len(inventory) == 6, "Fix this: how many devices in the indexed inventory?"
+assert find_device_by_hostname(inventory, "FW-01")["ip"] == "198.51.100.1", "Fix this: what is the firewall IP?"
+assert inventory.find_by_ip("10.0.2.10")["hostname"] == "ACC-SW-01", "Fix this: which device has 10.0.2.10?"
+assert len(get_devices_by_type(inventory, "Switch")) == 4, "Fix this: how many switches?"
+assert len(inventory.select("vlan", 1)) == 3, "Fix this: how many devices in VLAN 1?"
+
+assert update_device_ip(inventory, "FW-01", "198.51.100.2") == True, "Fix this: was the update successful?"
+assert inventory.find_by_ip("198.51.100.1") is None, "Fix this: is the old IP still indexed?"
+assert inventory.find_by_ip("198.51.100.2")["hostname"] == "FW-01", "Fix this: which device has the new IP?"
+
+inventory.update("ACC-SW-01", location="Floor 1")
+assert len(get_devices_by_location(inventory, "Floor 1")) == 2, "Fix this: how many devices on Floor 1 now?"
+assert get_devices_by_location(inventory, "Floor 3") == [], "Fix this: what is left on Floor 3?"
+
+assert inventory.update("ACC-SW-01", hostname="ACC-SW-11") == True, "Fix this: can a device be renamed?"
+assert "ACC-SW-01" not in inventory, "Fix this: is the old hostname still there?"
+assert inventory.find_by_ip("10.0.2.10")["hostname"] == "ACC-SW-11", "Fix this: which device has 10.0.2.10 now?"
+assert [device["hostname"] for device in inventory.select("location", "Floor 1")] == ["DIST-SW-01", "ACC-SW-11"], "Fix this: who is on Floor 1?"
+assert list(inventory.devices)[-1] == "ACC-SW-11", "Fix this: does a rename move the device?"
+
+# Groups keep the inventory order after an update, so indexed and plain
+# reports agree
+ordered = DeviceInventory([dict(devices[0], location="X"), dict(devices[1], location="Y"), dict(devices[2], location="X")])
+ordered.update(devices[1]["hostname"], location="X")
+assert [device["hostname"] for device in ordered.select("location", "X")] == [device["hostname"] for device in devices[:3]], "Fix this: in which order are the devices in X?"
+assert generate_inventory_report(ordered, sort_by="location") == generate_inventory_report(list(ordered), sort_by="location"), "Fix this: are both reports the same?"
+ordered.update(devices[0]["hostname"], hostname="AAA-RENAMED")
+assert generate_inventory_report(ordered, sort_by="type") == generate_inventory_report(list(ordered), sort_by="type"), "Fix this: and after a rename?"
+
+assert remove_device(inventory, "EDGE-RTR-01") == True, "Fix this: was the router removed?"
+assert "Router" not in count_devices_by_type(inventory), "Fix this: are there any routers left?"
+
+try:
+    add_device(inventory, "DIST-SW-03", "10.0.1.1", "Switch", 10, "Floor 1")
+    duplicate_rejected = False
+except ValueError:
+    duplicate_rejected = True
+assert duplicate_rejected == True, "Fix this: can two devices share 10.0.1.1?"
+assert len(inventory) == 5, "Fix this: how many devices are left?"
+
+# Change journal
+# To find out what changed since the last sync you would have to compare two
+# full inventories. Instead, JournaledInventory records every change with a
+# sequence number, so a consumer only asks for the changes after the last
+# number it has seen. Each change also keeps the old values, which is what
+# makes restore() possible.
+from collections import namedtuple
+
+# action is "add", "update" or "remove"; before/after hold the changed fields
+# (the whole device for add and remove)
+Change = namedtuple("Change", ["sequence", "action", "hostname", "before", "after"])
+
+class JournaledInventory(DeviceInventory):
+    """DeviceInventory that records every add, update and remove in a journal"""
+
+    def __init__(self, devices=()):
+        self.journal = []
+        self.trimmed = 0  # number of old changes dropped by trim()
+        super().__init__(devices)
+
+    @property
+    def sequence(self):
+        """Sequence number of the latest change (0 if nothing has changed yet)"""
+        return self.trimmed + len(self.journal)
+
+    def _record(self, action, hostname, before, after):
+        self.journal.append(Change(self.sequence + 1, action, hostname, before, after))
+
+    def add(self, device):
+        super().add(device)
+        self._record("add", device["hostname"], None, dict(device))
+        return device
+
+    def remove(self, hostname):
+        device = super().remove(hostname)
+        if device is not None:
+            self._record("remove", hostname, dict(device), None)
+        return device
+
+    def update(self, hostname, /, **changes):
+        device = self.find(hostname)
+        if device is None:
+            return False
+        before = {field: device.get(field) for field, value in changes.items() if device.get(field) != value}
+        super().update(hostname, **changes)
+        if before:
+            self._record("update", hostname, before, {field: changes[field] for field in before})
+        return True
+
+    def changes_since(self, sequence):
+        """All changes after the given sequence number, oldest first"""
+        if sequence < self.trimmed:
+            raise ValueError(f"Changes up to {self.trimmed} have been trimmed, do a full sync")
+        return self.journal[sequence - self.trimmed:]
+
+    def delta_since(self, sequence):
+        """Current state of every device changed since sequence (None = removed)"""
+        delta = {}
+        for change in self.changes_since(sequence):
+            delta[change.hostname] = None
+            if change.after and "hostname" in change.after:  # renamed
+                delta[change.after["hostname"]] = None
+        return {hostname: self.find(hostname) for hostname in delta}
+
+    def snapshot(self):
+        """A point to restore() to later - simply the current sequence number"""
+        return self.sequence
+
+    def restore(self, sequence):
+        """
+        Undo all changes after sequence, newest first. The undo steps are
+        journaled too, so consumers see them like any other change.
+        """
+        for change in reversed(self.changes_since(sequence)):
+            if change.action == "add":
+                self.remove(change.hostname)
+            elif change.action == "remove":
+                self.add(dict(change.before))
+            else:
+                self.update(change.after.get("hostname", change.hostname), **change.before)
+
+    def trim(self, sequence):
+        """Forget changes up to sequence, once every consumer has seen them"""
+        sequence = min(sequence, self.sequence)
+        if sequence > self.trimmed:
+            del self.journal[:sequence - self.trimmed]
+            self.trimmed = sequence
+
+journaled = JournaledInventory(dict(device) for device in devices)
+assert journaled.sequence == 6, "Fix this: how many changes does loading 6 devices record?"
+
+last_sync = journaled.snapshot()
+update_device_ip(journaled, "FW-01", "198.51.100.9")
+remove_device(journaled, "EDGE-RTR-01")
+add_device(journaled, "ACC-SW-02", "10.0.2.2", "Switch", 30, "Floor 3")
+
+changes = journaled.changes_since(last_sync)
+assert [change.action for change in changes] == ["update", "remove", "add"], "Fix this: what happened since the sync?"
+assert changes[0].before == {"ip": "198.51.100.1"}, "Fix this: what was the old firewall IP?"
+
+delta = journaled.delta_since(last_sync)
+assert delta["EDGE-RTR-01"] is None, "Fix this: what does a removed device look like in the delta?"
+assert delta["FW-01"]["ip"] == "198.51.100.9", "Fix this: what is the firewall IP in the delta?"
+
+journaled.restore(last_sync)
+assert "EDGE-RTR-01" in journaled and "ACC-SW-02" not in journaled, "Fix this: which devices are back?"
+assert journaled.find_by_ip("198.51.100.1")["hostname"] == "FW-01", "Fix this: which device has the old IP again?"
+assert journaled.sequence == 12, "Fix this: are the undo steps journaled as well?"
+
+renamed_at = journaled.snapshot()
+journaled.update("DIST-SW-02", hostname="DIST-SW-12", vlan=21)
+assert journaled.changes_since(renamed_at)[0].before == {"hostname": "DIST-SW-02", "vlan": 20}, "Fix this: what did the rename change?"
+assert journaled.delta_since(renamed_at) == {"DIST-SW-02": None, "DIST-SW-12": journaled.find("DIST-SW-12")}, "Fix this: what does a rename look like in the delta?"
+journaled.restore(renamed_at)
+assert journaled.find("DIST-SW-02")["vlan"] == 20 and "DIST-SW-12" not in journaled, "Fix this: is the rename undone?"
+assert journaled.sequence == 14, "Fix this: how many changes are journaled now?"
+
+journaled.trim(10)
+assert len(journaled.changes_since(10)) == 4, "Fix this: how many changes after 10 are kept?"
+
+# Columnar inventory
+# A device dictionary with five keys takes a few hundred bytes, most of it for
+# the dict itself and for repeated strings like "Switch" and "Floor 1". A
+# columnar store keeps one compact column per field instead: IP addresses as
+# 32-bit integers, VLANs as 16-bit integers and type/location as small codes
+# into a table where every distinct name is stored once.
+from array import array
+from collections import Counter
+
+def ip_to_int(ip):
+    a, b, c, d = map(int, ip.split("."))
+    if (a | b | c | d) & ~255:
+        raise ValueError(f"Invalid IP address: {ip}")
+    return a << 24 | b << 16 | c << 8 | d
+
+def int_to_ip(value):
+    return f"{value >> 24}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+class DeviceRow:
+    """View of one row in a ColumnarInventory that reads like a device dict"""
+
+    # No per-object __dict__, so a row view is only a few dozen bytes
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, field):
+        return self.store.get_field(self.row, field)
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return ColumnarInventory.FIELDS
+
+    def to_dict(self):
+        return {field: self[field] for field in ColumnarInventory.FIELDS}
+
+    def __repr__(self):
+        return f"DeviceRow({self.to_dict()!r})"
+
+class RowIndex:
+    """
+    Hash index from a key to a row number, kept in one array("I") of about
+    8 bytes per row instead of a dict with its key and number objects (~70).
+    The keys are not stored: key_of(row) reads them from the columns. So a
+    key must be discarded before its column changes, and added after.
+    """
+
+    __slots__ = ("key_of", "slots", "shift", "count")
+
+    def __init__(self, key_of):
+        self.key_of = key_of
+        self.rebuild(())
+
+    def _home(self, key):
+        # Fibonacci hashing spreads similar keys (10.0.1.1, 10.0.2.1, ...) over the table
+        return (hash(key) * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> self.shift
+
+    def _find(self, key):
+        """Slot that holds key, or the empty slot where it would go"""
+        slots, key_of = self.slots, self.key_of
+        mask = len(slots) - 1
+        slot = self._home(key)
+        while True:
+            entry = slots[slot]  # row + 1, 0 = empty
+            if not entry or key_of(entry - 1) == key:
+                return slot
+            slot = (slot + 1) & mask
+
+    def get(self, key, default=None):
+        entry = self.slots[self._find(key)]
+        return entry - 1 if entry else default
+
+    def __contains__(self, key):
+        return self.slots[self._find(key)] != 0
+
+    def add(self, key, row):
+        slot = self._find(key)
+        if not self.slots[slot]:
+            self.count += 1
+        self.slots[slot] = row + 1
+        if self.count * 2 > len(self.slots):  # keep at least half the slots free
+            self.rebuild(entry - 1 for entry in self.slots if entry)
+
+    def discard(self, key):
+        slots, mask = self.slots, len(self.slots) - 1
+        hole = self._find(key)
+        if not slots[hole]:
+            return
+        slots[hole] = 0
+        self.count -= 1
+        # Move later entries of the same probe run back, so none of them is
+        # cut off from its home slot by the new gap
+        slot = hole
+        while True:
+            slot = (slot + 1) & mask
+            entry = slots[slot]
+            if not entry:
+                return
+            if (slot - self._home(self.key_of(entry - 1))) & mask >= (slot - hole) & mask:
+                slots[hole], slots[slot] = entry, 0
+                hole = slot
+
+    def rows_removed(self, row):
+        """Renumber after the row has been deleted from the columns (discard its key first)"""
+        self.slots = array("I", [entry - 1 if entry > row + 1 else entry for entry in self.slots])
+
+    def rebuild(self, rows):
+        rows = list(rows)
+        bits = max(3, (2 * len(rows)).bit_length())
+        self.slots = array("I", bytes(4 << bits))
+        self.shift = 64 - bits
+        self.count = len(rows)
+        for row in rows:
+            self.slots[self._find(self.key_of(row))] = row + 1
+
+class ColumnarInventory:
+    """
+    Devices stored column by column. Supports the same queries as
+    DeviceInventory; hostnames and IP addresses are indexed with compact
+    RowIndexes, and select() scans a packed column instead of using an
+    extra dictionary. IP addresses must be unique, with or without a
+    prefix ("10.0.9.1/26" and "10.0.9.1" are the same address).
+    Row views point at a row number, so they are not valid after remove().
+    """
+
+    FIELDS = ("hostname", "ip", "type", "vlan", "location")
+    LABEL_FIELDS = ("type", "location")
+    NO_PREFIX = 255  # in the prefixes column: the IP was given without "/n"
+
+    def __init__(self, devices=()):
+        self.hostnames = []
+        self.ips = array("I")     # 4 bytes per device
+        self.prefixes = array("B")  # 1 byte per device
+        self.rows = RowIndex(self.hostnames.__getitem__)  # hostname -> row number
+        self.ip_rows = RowIndex(self.ips.__getitem__)     # address -> row number
+        self.vlans = array("H")   # 2 bytes per device, VLANs are 1-4094
+        self.codes = {field: array("H") for field in self.LABEL_FIELDS}
+        self.labels = {field: [] for field in self.LABEL_FIELDS}        # code -> name
+        self.label_codes = {field: {} for field in self.LABEL_FIELDS}   # name -> code
+        for device in devices:
+            self.add(device)
+
+    def __len__(self):
+        return len(self.hostnames)
+
+    def __iter__(self):
+        return (DeviceRow(self, row) for row in range(len(self.hostnames)))
+
+    def __contains__(self, hostname):
+        return hostname in self.rows
+
+    def _code(self, field, name):
+        codes = self.label_codes[field]
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(self.labels[field])
+            self.labels[field].append(name)
+        return code
+
+    def get_field(self, row, field):
+        if field == "hostname":
+            return self.hostnames[row]
+        if field == "ip":
+            return self._format_ip(self.ips[row], self.prefixes[row])
+        if field == "vlan":
+            return self.vlans[row]
+        if field in self.codes:
+            return self.labels[field][self.codes[field][row]]
+        raise KeyError(field)
+
+    def _format_ip(self, address, prefix):
+        if prefix == self.NO_PREFIX:
+            return int_to_ip(address)
+        return f"{int_to_ip(address)}/{prefix}"
+
+    @staticmethod
+    def _parse_ip(ip):
+        """(address, prefix) of "10.0.9.1/26" or "10.0.9.1" (prefix NO_PREFIX)"""
+        address, slash, prefix = ip.partition("/")
+        if not slash:
+            return ip_to_int(address), ColumnarInventory.NO_PREFIX
+        prefix = int(prefix)
+        if not 0 <= prefix <= 32:
+            raise ValueError(f"Invalid prefix length: {ip}")
+        return ip_to_int(address), prefix
+
+    def _check(self, device, row=None):
+        """
+        Validate every field of a device before any column is written, so a
+        bad value cannot leave the columns with different lengths or a row
+        half updated. row is the device's own row when it is being updated.
+        Returns (address, prefix) of its IP and the type and location names.
+        """
+        hostname = device["hostname"]
+        if self.rows.get(hostname, row) != row:
+            raise ValueError(f"Duplicate hostname: {hostname}")
+        address, prefix = self._parse_ip(device["ip"])
+        if self.ip_rows.get(address, row) != row:
+            raise ValueError(f"Duplicate IP address: {device['ip']}")
+        vlan = device["vlan"]
+        if not (isinstance(vlan, int) and 1 <= vlan <= 4094):
+            raise ValueError(f"Invalid VLAN: {vlan!r}")
+        labels = [device[field] for field in self.LABEL_FIELDS]
+        for field, name in zip(self.LABEL_FIELDS, labels):
+            # A new name gets the next code, which has to fit the array("H") column
+            if name not in self.label_codes[field] and len(self.labels[field]) > 0xFFFF:
+                raise ValueError(f"Too many different {field} names")
+        return address, prefix, labels
+
+    def add(self, device):
+        """Add a device (any mapping with the five fields); hostnames and IPs must be unique"""
+        address, prefix, labels = self._check(device)
+        hostname = device["hostname"]
+        row = len(self.hostnames)
+        self.hostnames.append(hostname)
+        self.ips.append(address)
+        self.prefixes.append(prefix)
+        self.vlans.append(device["vlan"])
+        for field, name in zip(self.LABEL_FIELDS, labels):
+            self.codes[field].append(self._code(field, name))
+        self.rows.add(hostname, row)
+        self.ip_rows.add(address, row)
+        return DeviceRow(self, row)
+
+    def remove(self, hostname):
+        """Remove a device and return it as a dict (None if there is no such device)"""
+        row = self.rows.get(hostname)
+        if row is None:
+            return None
+        device = {field: self.get_field(row, field) for field in self.FIELDS}
+        self.rows.discard(hostname)
+        self.ip_rows.discard(self.ips[row])
+        del self.hostnames[row], self.ips[row], self.prefixes[row], self.vlans[row]
+        for column in self.codes.values():
+            del column[row]
+        self.rows.rows_removed(row)
+        self.ip_rows.rows_removed(row)
+        return device
+
+    def update(self, hostname, /, **changes):
+        """Change fields of a device; nothing is changed if any new value is invalid"""
+        row = self.rows.get(hostname)
+        if row is None:
+            return False
+        for field in changes:
+            if field not in self.FIELDS:
+                raise KeyError(field)
+        device = {field: self.get_field(row, field) for field in self.FIELDS}
+        device.update(changes)
+        address, prefix, labels = self._check(device, row)
+
+        if device["hostname"] != hostname:
+            self.rows.discard(hostname)
+            self.hostnames[row] = device["hostname"]
+            self.rows.add(device["hostname"], row)
+        if address != self.ips[row]:
+            self.ip_rows.discard(self.ips[row])
+            self.ips[row] = address
+            self.ip_rows.add(address, row)
+        self.prefixes[row] = prefix
+        self.vlans[row] = device["vlan"]
+        for field, name in zip(self.LABEL_FIELDS, labels):
+            self.codes[field][row] = self._code(field, name)
+        return True
+
+    def find(self, hostname):
+        row = self.rows.get(hostname)
+        return None if row is None else DeviceRow(self, row)
+
+    def find_by_ip(self, ip):
+        row = self.ip_rows.get(self._parse_ip(ip)[0])
+        return None if row is None else DeviceRow(self, row)
+
+    def _column(self, field, value):
+        if field == "vlan":
+            return self.vlans, value
+        return self.codes[field], self.label_codes[field].get(value)
+
+    def select(self, field, value):
+        column, code = self._column(field, value)
+        return [DeviceRow(self, row) for row, other in enumerate(column) if other == code]
+
+    def count_by(self, field):
+        counts = Counter(self.vlans if field == "vlan" else self.codes[field])
+        if field == "vlan":
+            return dict(counts)
+        return {self.labels[field][code]: count for code, count in counts.items()}
+
+    def distinct(self, field):
+        if field == "hostname":
+            return self.hostnames
+        if field == "ip":
+            return set(map(self._format_ip, self.ips, self.prefixes))
+        return self.count_by(field).keys()  # only names some device still uses
+
+    def sorted_by(self, field):
+        """Row views ordered by a field; only the row numbers are sorted"""
+        if field == "hostname":
+            keys = self.hostnames
+        elif field in self.codes:
+            labels = self.labels[field]
+            rank = [0] * len(labels)
+            for position, code in enumerate(sorted(range(len(labels)), key=labels.__getitem__)):
+                rank[code] = position
+            keys = [rank[code] for code in self.codes[field]]
+        else:
+            keys = self.ips if field == "ip" else self.vlans  # numbers sort correctly
+        rows = sorted(range(len(keys)), key=keys.__getitem__)
+        return (DeviceRow(self, row) for row in rows)
+
+compact = ColumnarInventory(devices)
+assert len(compact) == 6, "Fix this: how many devices in the columnar inventory?"
+assert find_device_by_hostname(compact, "CORE-SW-01")["ip"] == "10.0.0.1", "Fix this: what is the core switch IP?"
+assert compact.find_by_ip("203.0.113.1")["hostname"] == "EDGE-RTR-01", "Fix this: which device has 203.0.113.1?"
+assert len(get_devices_by_type(compact, "Switch")) == 4, "Fix this: how many switches?"
+assert count_devices_by_type(compact)["Firewall"] == 1, "Fix this: how many firewalls?"
+assert len(compact.labels["location"]) == 5, "Fix this: how many distinct location names are stored?"
+assert not hasattr(compact.find("FW-01"), "__dict__"), "Fix this: does a row view have a __dict__?"
+
+# Rows read like dicts, so the report functions work unchanged
+assert generate_inventory_report(list(compact)[:2]) == generate_inventory_report(devices[:2]), "Fix this: is the report the same?"
+assert export_to_csv(list(compact)[:2]) == export_to_csv(devices[:2]), "Fix this: is the CSV the same?"
+
+assert update_device_ip(compact, "ACC-SW-01", "10.0.2.20") == True, "Fix this: was the update successful?"
+assert compact.find("ACC-SW-01")["ip"] == "10.0.2.20", "Fix this: what is the updated IP?"
+assert remove_device(compact, "DIST-SW-01") == True, "Fix this: was the switch removed?"
+assert compact.find("DIST-SW-02")["vlan"] == 20, "Fix this: what VLAN is DIST-SW-02 in after the removal?"
+
+compact.add(small_subnet)
+assert compact.find("LAB-SW-01")["ip"] == "10.0.9.1/26", "Fix this: is the prefix kept?"
+assert compact.find_by_ip("10.0.9.1")["hostname"] == "LAB-SW-01", "Fix this: which device has 10.0.9.1?"
+try:
+    add_device(compact, "DIST-SW-03", "10.0.2.20", "Switch", 10, "Floor 1")
+    duplicate_rejected = False
+except ValueError:
+    duplicate_rejected = True
+assert duplicate_rejected == True, "Fix this: can two devices share 10.0.2.20?"
+
+try:
+    compact.update("LAB-SW-01", hostname="LAB-SW-02", location="Lab 2", vlan=70000)
+    bad_vlan_rejected = False
+except ValueError:
+    bad_vlan_rejected = True
+assert bad_vlan_rejected == True, "Fix this: is VLAN 70000 valid?"
+assert compact.find("LAB-SW-01")["location"] == "Lab", "Fix this: did the failed update change anything?"
+
+assert compact.update("LAB-SW-01", hostname="LAB-SW-02") == True, "Fix this: can a device be renamed?"
+assert "LAB-SW-01" not in compact and compact.find("LAB-SW-02")["vlan"] == 90, "Fix this: which hostname does the lab switch have now?"
+assert compact.find_by_ip("10.0.9.1")["hostname"] == "LAB-SW-02", "Fix this: does the IP index follow the rename?"
+
+# A removed name keeps its code, but it no longer widens the report
+add_device(compact, "WLC-01", "10.0.5.1", "Wireless LAN Controller", 50, "Floor 1")
+remove_device(compact, "WLC-01")
+assert "Wireless LAN Controller" not in compact.distinct("type"), "Fix this: is the controller type still in use?"
+assert generate_inventory_report(compact) == generate_inventory_report(list(compact)), "Fix this: is the type column as wide as before?"
+
+# Label codes are 16 bits, so at most 65,536 different names per field
+crowded = ColumnarInventory()
+for number in range(0x10000):
+    crowded._code("location", f"Rack {number}")
+try:
+    add_device(crowded, "RACK-SW-01", "10.1.0.1", "Switch", 10, "One rack too many")
+    too_many_rejected = False
+except ValueError:
+    too_many_rejected = True
+assert too_many_rejected == True, "Fix this: is there a code left for another location?"
+assert len(crowded) == 0 and len(crowded.labels["type"]) == 0, "Fix this: did the failed add change anything?"
+assert len({len(compact.hostnames), len(compact.ips), len(compact.prefixes), len(compact.vlans)}) == 1, "Fix this: do all columns have the same length?"
+
+# Sorted and paged reports straight from the indexes
+for indexed in (inventory, compact):
+    for column in ("hostname", "ip", "location"):
+        from_index = generate_inventory_report(indexed, sort_by=column)
+        assert from_index == generate_inventory_report(list(indexed), sort_by=column), f"Fix this: is the {column} order the same?"
+first_by_ip = generate_inventory_report(compact, sort_by="ip", page=1, page_size=1).split("\n")[2]
+assert first_by_ip.startswith("CORE-SW-01"), "Fix this: which device has the lowest IP?"
+
 print("✓ Network Koan 2 completed! You can manage device inventories.")
@@ -38,6 +38,168 @@ def parse_all_logs(log_list):
 parsed_logs = parse_all_logs(network_logs)
 assert len(parsed_logs) == 7, "Fix this: how many logs were parsed?"
 
+# Fast log parsing
+# A dict per line gets expensive at tens of thousands of lines per second.
+# A log line becomes a plain tuple (epoch, device, level, message): the
+# timestamp as seconds since 1970 (UTC) and the level as a small number.
+# LogRecord is a named tuple around the same values, for record.device and
+# log["level"]. A precompiled regular expression checks a line thoroughly;
+# after that, timestamps, devices and levels that have been seen before
+# are simple dictionary lookups.
+import re
+import sys
+import calendar
+from collections import namedtuple
+from functools import partial
+from time import gmtime, strftime
+
+LEVELS = dict(enumerate(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]))  # code -> name, least severe first
+LEVEL_CODES = {name: code for code, name in LEVELS.items()}
+
+def level_code(name):
+    """
+    Small number for a level name. Unknown levels (NOTICE, ...) found while
+    parsing get negative codes, so they never outrank the real levels, e.g.
+    in a min_level filter. Queries use LEVEL_CODES.get instead, so looking
+    up a misspelled level does not add it.
+    """
+    code = LEVEL_CODES.get(name)
+    if code is None:
+        code = LEVEL_CODES[name] = min(LEVELS) - 1
+        LEVELS[code] = name
+    return code
+
+LOG_PATTERN = re.compile(r"(\d{4}-\d\d-\d\d) ([01]\d|2[0-3]):([0-5]\d):([0-5]\d) \| (\S+) \| (\w+) \| (.*)")
+
+_day_starts = {}  # "2025-10-07" -> seconds at midnight, so every date is parsed only once
+_device_names = {}  # every device name LOG_PATTERN has accepted -> its interned copy
+# "2025-10-07 09:15:23" -> seconds since 1970, for every second of the minutes
+# LOG_PATTERN has accepted. One lookup is cheaper than slicing the timestamp.
+_second_epochs = {}
+MAX_SECOND_EPOCHS = 3600  # the last hour or so; then the table starts over
+# "09:15" -> seconds since midnight and ":23" -> 23; looking these up is faster
+# than int(), and a time like 25:00 or 09:61 is simply not found
+CLOCK_MINUTES = {f"{hour:02d}:{minute:02d}": hour * 3600 + minute * 60 for hour in range(24) for minute in range(60)}
+CLOCK_SECONDS = {f":{second:02d}": second for second in range(60)}
+
+def day_start(date):
+    start = _day_starts.get(date)
+    if start is None:
+        # strptime raises ValueError for dates like 2025-02-30
+        start = _day_starts[date] = calendar.timegm(datetime.strptime(date, "%Y-%m-%d").timetuple())
+    return start
+
+def add_minute(minute, start):
+    """Put all timestamps of a minute ("2025-10-07 09:15") into _second_epochs"""
+    if len(_second_epochs) >= MAX_SECOND_EPOCHS:
+        _second_epochs.clear()
+    _second_epochs.update(zip([minute + second for second in CLOCK_SECONDS], range(start, start + 60)))
+
+def format_epoch(epoch):
+    return strftime("%Y-%m-%d %H:%M:%S", gmtime(epoch))
+
+class LogRecord(namedtuple("LogRecord", ["epoch", "device", "level", "message"])):
+    """One parsed log line; log["level"] etc. work like with parse_log_entry"""
+
+    __slots__ = ()
+
+    @property
+    def level_name(self):
+        return LEVELS[self.level]
+
+    def __getitem__(self, key):
+        if key.__class__ is not str:
+            return tuple.__getitem__(self, key)  # record[0], record[1:] as for any tuple
+        if key == "timestamp":
+            return format_epoch(self.epoch)
+        if key == "level":
+            return LEVELS[self.level]
+        if key == "device":
+            return self.device
+        if key == "message":
+            return self.message
+        raise KeyError(key)
+
+    def __repr__(self):
+        return f"LogRecord({format_epoch(self.epoch)!r}, {self.device!r}, {self.level_name!r}, {self.message!r})"
+
+def parse_log_record(line):
+    """LogRecord for a log line, or None if the line is malformed"""
+    match = LOG_PATTERN.match(line)
+    if match is None:
+        return None
+    date, hour, minute, second, device, level, message = match.groups()
+    try:
+        start = day_start(date)
+    except ValueError:
+        return None
+    minute_start = start + int(hour) * 3600 + int(minute) * 60
+    if f"{date} {hour}:{minute}:00" not in _second_epochs:
+        add_minute(f"{date} {hour}:{minute}", minute_start)
+    # Device names repeat on every line; interning keeps one copy of each
+    device = _device_names.setdefault(device, sys.intern(device))
+    return LogRecord(minute_start + int(second), device, level_code(level), message)
+
+def parse_log_rows(lines, bad_lines=None):
+    """
+    Parse lines lazily into (epoch, device, level, message) tuples, skipping
+    blank and malformed ones. If bad_lines is a list, (line number, line) is
+    appended to it for every malformed line.
+
+    Most lines take a fast path: split() plus table lookups for the
+    timestamp, device and level. The tables only hold values LOG_PATTERN
+    has already accepted, so the fast path accepts exactly the same lines.
+    A value that has not been seen yet, or a line that is not shaped like a
+    log line, goes through parse_log_record.
+    """
+    second_epochs, device_names, level_codes = _second_epochs, _device_names, LEVEL_CODES
+    for number, line in enumerate(lines, 1):
+        try:
+            timestamp, device, level, message = line.split(" | ", 3)
+            row = (second_epochs[timestamp], device_names[device], level_codes[level], message.rstrip("\n"))
+        except (ValueError, KeyError):
+            row = parse_log_record(line)
+            if row is None:
+                if bad_lines is not None and line.strip():
+                    bad_lines.append((number, line))
+                continue
+        yield row
+
+# LogRecord(*row) without the extra Python call of the namedtuple constructor
+as_log_record = partial(tuple.__new__, LogRecord)
+
+def parse_log_records(lines, bad_lines=None):
+    """Like parse_log_rows, but yields LogRecords"""
+    return map(as_log_record, parse_log_rows(lines, bad_lines))
+
+record = parse_log_record(network_logs[2])
+assert record.device == "DIST-SW-01", "Fix this: what device generated the third log?"
+assert record.level_name == "ERROR" and record.level == 3, "Fix this: what is the level, and its code?"
+assert record.epoch - parse_log_record(network_logs[0]).epoch == 109, "Fix this: how many seconds after the first log?"
+assert record["timestamp"] == "2025-10-07 09:17:12", "Fix this: what is the timestamp as text?"
+assert not hasattr(record, "__dict__"), "Fix this: does a LogRecord have a __dict__?"
+
+messy_logs = network_logs + [
+    "garbage",
+    "2025-10-07 25:00:00 | CORE-SW-01 | INFO | hour 25",
+    "2025-02-30 10:00:00 | CORE-SW-01 | INFO | February 30",
+    "2025-10-07 10:00:00 | CORE-SW-01 | NOTICE | Config saved",
+]
+bad_lines = []
+records = list(parse_log_records(messy_logs, bad_lines))
+assert len(records) == 8, "Fix this: how many lines could be parsed?"
+assert [number for number, line in bad_lines] == [8, 9, 10], "Fix this: which lines were malformed?"
+assert records[-1].level_name == "NOTICE", "Fix this: what level does the last record have?"
+assert list(parse_log_rows(messy_logs)) == records, "Fix this: do rows hold the same values as records?"
+assert records[0][1] == records[0].device == "CORE-SW-01", "Fix this: which device is in column 1?"
+
+# A line is accepted or rejected the same way, whether its date was seen before or not
+odd_lines = ["2025-10-07 09:15:23 | CORE SW 01 | INFO | spaces in the device name",
+             "2025-10-07T09:15x23 |  | INFO | no device"]
+assert list(parse_log_records(odd_lines)) == [], "Fix this: are these valid log lines?"
+assert list(parse_log_records(["2030-01-01 00:00:00 | CORE SW 01 | INFO | new date"])) == [], "Fix this: is this a valid log line?"
+assert [log["level"] for log in records].count("ERROR") == 3, "Fix this: how many ERROR records?"
+
 # Filter logs by severity level
 def filter_by_level(logs, level):
     result = []
@@ -71,20 +233,270 @@ device_log_counts = count_logs_by_device(parsed_logs)
 assert device_log_counts["DIST-SW-01"] == 2, "Fix this: how many logs from DIST-SW-01?"
 
 # Detect critical issues
-def detect_critical_issues(logs):
-    critical = []
-    keywords = ["DOWN", "loop detected", "Unauthorized", "failed"]
+# Checking every keyword against every message is logs x keywords substring
+# searches, which is too slow with thousands of indicators. KeywordMatcher
+# builds one regular expression from all keywords instead. Keywords are put
+# in a trie first, so a shared beginning is only tested once:
+# ["fail", "failed", "failover"] becomes fail(?:ed|over)?
+def trie_pattern(words):
+    """Regular expression matching any of the words, longest match first"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # a word ends here
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:  # a shorter word ends here, so the rest is optional
+            pattern = f"(?:{pattern})?" if len(branches) == 1 else pattern + "?"
+        return pattern
+
+    return build(trie)
 
+class KeywordMatcher:
+    """
+    Finds any of many keywords in a message with one compiled regex.
+    keywords is a list, or a dict from keyword to a severity tag.
+    whole_words=True only matches keywords that are not part of a longer word.
+    """
+
+    def __init__(self, keywords, ignore_case=False, whole_words=False, default_severity="CRITICAL"):
+        if not isinstance(keywords, dict):
+            keywords = dict.fromkeys(keywords, default_severity)
+        self.ignore_case = ignore_case
+        # matched text (lower case with ignore_case) -> (keyword, severity)
+        self.keywords = {(keyword.lower() if ignore_case else keyword): (keyword, severity)
+                         for keyword, severity in keywords.items() if keyword}
+        # re.IGNORECASE also matches Unicode case variants that lower() keeps,
+        # like "ſ" (long s) for "s" or the Kelvin sign for "k"; casefold() maps most of them
+        self.folded = {keyword.casefold(): hit for keyword, hit in self.keywords.items()} if ignore_case else {}
+        self.pattern = trie_pattern(self.keywords) or "(?!)"  # (?!) never matches
+        if whole_words:
+            self.pattern = rf"(?<!\w)(?:{self.pattern})(?!\w)"
+        self.regex = re.compile(self.pattern, re.IGNORECASE if ignore_case else 0)
+
+    def _hit(self, text):
+        if not self.ignore_case:
+            return self.keywords[text]
+        hit = self.keywords.get(text.lower()) or self.folded.get(text.casefold())
+        if hit is None:
+            # Rare: ask the regex engine which keyword it considers equal
+            hit = next(hit for keyword, hit in self.keywords.items()
+                       if re.fullmatch(re.escape(keyword), text, re.IGNORECASE))
+        return hit
+
+    def search(self, message):
+        """(keyword, severity) of the first keyword in the message, or None"""
+        match = self.regex.search(message)
+        return None if match is None else self._hit(match.group())
+
+    def find_all(self, message):
+        """Every keyword found, as (keyword, severity) pairs (matches do not overlap)"""
+        return [self._hit(text) for text in self.regex.findall(message)]
+
+CRITICAL_KEYWORDS = ["DOWN", "loop detected", "Unauthorized", "failed"]
+CRITICAL_MATCHER = KeywordMatcher(CRITICAL_KEYWORDS)
+
+def is_critical(message, matcher=CRITICAL_MATCHER):
+    return matcher.regex.search(message) is not None
+
+def detect_critical_issues(logs, matcher=CRITICAL_MATCHER):
+    search = matcher.regex.search
+    return [log for log in logs if search(log["message"])]
+
+def find_indicators(logs, matcher):
+    """(log, [(keyword, severity), ...]) for every log where the matcher finds something"""
     for log in logs:
-        for keyword in keywords:
-            if keyword in log["message"]:
-                critical.append(log)
-                break
-    return critical
+        hits = matcher.find_all(log["message"])
+        if hits:
+            yield log, hits
 
 critical_issues = detect_critical_issues(parsed_logs)
 assert len(critical_issues) == 3, "Fix this: how many critical issues?"
 
+assert KeywordMatcher(["fail", "failed", "failover"]).pattern == "fail(?:ed|over)?", "Fix this: what does the trie turn into?"
+assert KeywordMatcher(["fail", "failed"]).search("login failed") == ("failed", "CRITICAL"), "Fix this: which keyword matches?"
+
+indicators = KeywordMatcher({"down": "major", "loop detected": "critical", "unauthorized": "security"}, ignore_case=True)
+tagged = list(find_indicators(parsed_logs, indicators))
+assert len(tagged) == 3, "Fix this: how many logs have an indicator?"
+assert tagged[2][1] == [("unauthorized", "security")], "Fix this: which indicator and severity did FW-01 get?"
+# "ſ" is an old form of "s" and matches it when case is ignored
+assert KeywordMatcher(["session failed"], ignore_case=True).search("ſession FAILED") == ("session failed", "CRITICAL"), "Fix this: which keyword matches?"
+
+whole_word = KeywordMatcher(["DOWN"], whole_words=True)
+assert whole_word.search("Port Gi0/5 is DOWN") == ("DOWN", "CRITICAL"), "Fix this: is DOWN found?"
+assert whole_word.search("SHUTDOWN requested") is None, "Fix this: does SHUTDOWN count as DOWN?"
+
+# Streaming log pipeline
+# The functions above take and return whole lists, so a day of logs has to
+# fit in memory and is gone through once per function. A pipeline reads the
+# log lazily, applies all filters in the same loop and counts everything in
+# one pass, so memory use does not grow with the size of the log.
+import io
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+
+def read_log_lines(source):
+    """Lines from a file name or an open file, read one at a time"""
+    if isinstance(source, str):
+        with open(source, encoding="utf-8", errors="replace") as log_file:
+            yield from log_file
+    else:
+        yield from source
+
+def timestamp_to_epoch(timestamp):
+    """"2025-10-07 09:18:00" -> seconds since 1970, like LogRecord.epoch"""
+    return day_start(timestamp[:10]) + CLOCK_MINUTES[timestamp[11:16]] + CLOCK_SECONDS[timestamp[16:19]]
+
+class LogSummary:
+    """Everything generate_monitoring_report needs from the logs, counted in one pass"""
+
+    BATCH = 512  # logs counted together; bounds the memory a stream needs
+
+    def __init__(self):
+        self.total = 0
+        self.levels = Counter()   # level name -> count
+        self.devices = Counter()  # device -> count
+        self.critical = 0
+
+    def update(self, logs):
+        """Count logs: rows from parse_log_rows, LogRecords, or dicts from parse_log_entry"""
+        search = CRITICAL_MATCHER.regex.search
+        logs = iter(logs)
+        while True:
+            batch = list(islice(logs, self.BATCH))
+            if not batch:
+                return self
+            if isinstance(batch[0], tuple):
+                # Counter.update and map count a whole column without a Python loop
+                _, devices, codes, messages = zip(*batch)
+                for code, count in Counter(codes).items():
+                    self.levels[LEVELS[code]] += count
+            else:
+                devices = [log["device"] for log in batch]
+                messages = [log["message"] for log in batch]
+                self.levels.update(log["level"] for log in batch)
+            self.devices.update(devices)
+            self.critical += len(list(filter(None, map(search, messages))))
+            self.total += len(batch)
+
+class LogPipeline:
+    """
+    Log lines -> LogRecords -> filters -> counts, one record at a time:
+
+        LogPipeline(read_log_lines("syslog.txt")).where(level="ERROR").count_by_device()
+
+    Filters added with where() are combined and checked in a single loop.
+    The lines are read when the pipeline is iterated, and only once. The
+    counts use plain rows; LogRecords are built only for iteration and
+    predicates.
+    """
+
+    def __init__(self, lines, bad_lines=None):
+        self.lines = lines
+        self.bad_lines = bad_lines
+        self.levels = None   # set of level codes, None = any
+        self.devices = None  # set of device names, None = any
+        self.min_level = None
+        self.since = None
+        self.until = None
+        self.predicates = []
+
+    @staticmethod
+    def _narrow(current, values):
+        values = {values} if isinstance(values, (str, int)) else set(values)
+        return values if current is None else current & values
+
+    def where(self, level=None, device=None, min_level=None, since=None, until=None, predicate=None):
+        """
+        Keep only matching records: level and device take one value or a
+        list, min_level a level name, since/until epoch seconds (until is
+        exclusive) and predicate a function of the record. Returns self.
+        """
+        if level is not None:
+            names = [level] if isinstance(level, str) else level
+            self.levels = self._narrow(self.levels, [LEVEL_CODES.get(name) for name in names])
+        if device is not None:
+            self.devices = self._narrow(self.devices, device)
+        if min_level is not None:
+            code = LEVEL_CODES.get(min_level)
+            if code is None:
+                raise ValueError(f"Unknown level: {min_level}")
+            self.min_level = code if self.min_level is None else max(self.min_level, code)
+        if since is not None:
+            self.since = since if self.since is None else max(self.since, since)
+        if until is not None:
+            self.until = until if self.until is None else min(self.until, until)
+        if predicate is not None:
+            self.predicates.append(predicate)
+        return self
+
+    def __iter__(self):
+        return map(as_log_record, self.rows())
+
+    def rows(self):
+        """The matching records as plain (epoch, device, level, message) tuples"""
+        rows = parse_log_rows(self.lines, self.bad_lines)
+        filters = (self.levels, self.devices, self.min_level, self.since, self.until)
+        if filters == (None, None, None, None, None) and not self.predicates:
+            return rows
+        return self._filter(rows)
+
+    def _filter(self, rows):
+        levels, devices, min_level = self.levels, self.devices, self.min_level
+        since, until, predicates = self.since, self.until, self.predicates
+        for row in rows:
+            epoch, device, level, message = row
+            if levels is not None and level not in levels:
+                continue
+            if min_level is not None and level < min_level:
+                continue
+            if devices is not None and device not in devices:
+                continue
+            if since is not None and epoch < since:
+                continue
+            if until is not None and epoch >= until:
+                continue
+            if predicates:
+                record = as_log_record(row)
+                if not all(predicate(record) for predicate in predicates):
+                    continue
+            yield row
+
+    def count(self):
+        return sum(1 for _ in self.rows())
+
+    def count_by_device(self):
+        return dict(Counter(map(itemgetter(1), self.rows())))
+
+    def summarize(self):
+        return LogSummary().update(self.rows())
+
+assert LogPipeline(network_logs).where(level="ERROR").count() == 3, "Fix this: how many ERROR logs?"
+assert LogPipeline(network_logs).where(level="ERROR", device="DIST-SW-01").count() == 2, "Fix this: how many errors from DIST-SW-01?"
+assert LogPipeline(network_logs).where(min_level="WARNING").count() == 5, "Fix this: how many WARNING or worse?"
+assert LogPipeline(messy_logs).where(min_level="ERROR").count() == 3, "Fix this: does NOTICE count as ERROR or worse?"
+assert LogPipeline(messy_logs).where(level="EROR").count() == 0, "Fix this: how many logs have the misspelled level?"
+assert "EROR" not in LEVEL_CODES, "Fix this: did the query add a new level?"
+assert LogPipeline(network_logs).count_by_device() == count_logs_by_device(parsed_logs), "Fix this: are the counts the same?"
+
+since_0918 = timestamp_to_epoch("2025-10-07 09:18:00")
+assert LogPipeline(network_logs).where(since=since_0918).count() == 4, "Fix this: how many logs since 09:18?"
+
+long_messages = LogPipeline(network_logs).where(predicate=lambda record: len(record.message) > 30)
+assert [row[1] for row in long_messages.rows()] == [record.device for record in long_messages], "Fix this: do rows and records match?"
+
+log_file = io.StringIO("\n".join(network_logs) + "\n")  # works the same with an open file
+stream_summary = LogPipeline(read_log_lines(log_file)).summarize()
+assert stream_summary.levels["ERROR"] == 3 and stream_summary.critical == 3, "Fix this: errors and critical issues?"
+
 # Network performance metrics
 performance_data = [
     {"device": "CORE-SW-01", "timestamp": "09:00", "cpu": 45, "memory": 60, "bandwidth": 250},
@@ -96,6 +508,9 @@ performance_data = [
 
 # Calculate average CPU usage
 def calculate_average_cpu(metrics, device_name):
+    if hasattr(metrics, "stats"):  # MetricTracker (see below) keeps running statistics
+        stats = metrics.stats(device_name, "cpu")
+        return stats.mean if stats else 0
     device_metrics = [m for m in metrics if m["device"] == device_name]
     if not device_metrics:
         return 0
@@ -136,6 +551,8 @@ assert "85%" in alert["message"], "Fix this: alert message should contain CPU pe
 
 # Bandwidth analysis
 def calculate_total_bandwidth(metrics):
+    if hasattr(metrics, "total"):
+        return metrics.total("bandwidth")
     return sum(m["bandwidth"] for m in metrics)
 
 total_bw = calculate_total_bandwidth(performance_data)
@@ -143,6 +560,8 @@ assert total_bw == 1740, "Fix this: what is total bandwidth? (1740)"
 
 # Find peak bandwidth usage
 def find_peak_bandwidth(metrics):
+    if hasattr(metrics, "peak"):
+        return metrics.peak("bandwidth")
     if not metrics:
         return None
 
@@ -158,19 +577,24 @@ assert peak["device"] == "CORE-SW-01", "Fix this: which device had peak bandwidt
 
 # Generate monitoring report
 def generate_monitoring_report(logs, metrics):
-    error_count = len(filter_by_level(logs, "ERROR"))
-    warning_count = len(filter_by_level(logs, "WARNING"))
-    critical_count = len(detect_critical_issues(logs))
+    """One pass over logs and one over metrics; both may be generators or a LogPipeline"""
+    summary = LogSummary().update(logs)
 
-    avg_cpu_all = sum(m["cpu"] for m in metrics) / len(metrics) if metrics else 0
+    cpu_total = metric_count = 0
+    devices = set()
+    for m in metrics:
+        cpu_total += m["cpu"]
+        metric_count += 1
+        devices.add(m["device"])
+    avg_cpu_all = cpu_total / metric_count if metric_count else 0
 
     report = {
-        "total_logs": len(logs),
-        "errors": error_count,
-        "warnings": warning_count,
-        "critical_issues": critical_count,
+        "total_logs": summary.total,
+        "errors": summary.levels["ERROR"],
+        "warnings": summary.levels["WARNING"],
+        "critical_issues": summary.critical,
         "average_cpu": round(avg_cpu_all, 2),
-        "devices_monitored": len(set(m["device"] for m in metrics))
+        "devices_monitored": len(devices)
     }
     return report
 
@@ -179,6 +603,9 @@ assert report["errors"] == 3, "Fix this: how many errors in report?"
 assert report["critical_issues"] == 3, "Fix this: how many critical issues?"
 assert report["devices_monitored"] == 2, "Fix this: how many devices monitored?"
 
+streamed_report = generate_monitoring_report(LogPipeline(network_logs), iter(performance_data))
+assert streamed_report == report, "Fix this: is the streamed report the same?"
+
 # Uptime calculation (in minutes)
 def calculate_uptime(start_time, end_time):
     """Calculate uptime in minutes from HH:MM format"""
@@ -201,6 +628,8 @@ def calculate_health_score(metrics):
     - Memory usage (lower is better)
     Weight: 50% CPU, 50% Memory
     """
+    if hasattr(metrics, "health_score"):
+        return metrics.health_score()
     if not metrics:
         return 0
 
@@ -219,6 +648,364 @@ health = calculate_health_score(core_metrics)
 assert health > 0, "Fix this: health score should be positive"
 # The score should be around 36.33 based on avg CPU 57.33 and avg memory 66.67
 
+# Running statistics
+# The functions above go through the whole metrics list on every call. A
+# MetricTracker updates a few numbers per device and metric for every new
+# sample instead, so asking for the current average, spread or percentile
+# costs the same no matter how much history there is.
+class P2Quantile:
+    """
+    Estimates a quantile (0.95 = 95th percentile) without storing the samples,
+    with the P-square algorithm: five markers whose heights are adjusted as
+    samples arrive, so that the middle one follows the quantile.
+    """
+
+    __slots__ = ("quantile", "heights", "positions", "desired", "increments")
+
+    def __init__(self, quantile):
+        self.quantile = quantile
+        self.heights = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4]
+        self.increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value):
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        positions, desired = self.positions, self.desired
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            desired[i] += self.increments[i]
+        for i in (1, 2, 3):
+            offset = desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+               (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        heights = self.heights
+        if len(heights) < 5:  # few samples: exact, from the sorted samples
+            return heights[min(len(heights) - 1, int(self.quantile * len(heights)))] if heights else None
+        return heights[2]
+
+class RunningStats:
+    """Count, total, mean, variance (Welford), min, max, last value, EWMA and percentiles of a stream"""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "last", "ewma", "alpha",
+                 "_mean", "_squares", "percentiles")
+
+    def __init__(self, alpha=0.3, percentiles=(0.5, 0.95)):
+        self.count = 0
+        self.total = 0
+        self.minimum = self.maximum = self.last = self.ewma = None
+        self.alpha = alpha  # weight of the newest value in the EWMA
+        self._mean = 0.0     # Welford's running mean and sum of squared differences
+        self._squares = 0.0
+        self.percentiles = {quantile: P2Quantile(quantile) for quantile in percentiles}
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._squares += delta * (value - self._mean)
+        if self.count == 1:
+            self.minimum = self.maximum = self.ewma = value
+        else:
+            if value < self.minimum:
+                self.minimum = value
+            if value > self.maximum:
+                self.maximum = value
+            self.ewma += self.alpha * (value - self.ewma)
+        self.last = value
+        for estimator in self.percentiles.values():
+            estimator.add(value)
+
+    @property
+    def mean(self):
+        # total / count is exact for integer samples, the running mean may be off in the last digit
+        return self.total / self.count if self.count else 0
+
+    @property
+    def variance(self):
+        """Sample variance"""
+        return self._squares / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return self.variance ** 0.5
+
+    def percentile(self, quantile):
+        """Approximate percentile; only the ones given when creating the stats are tracked"""
+        return self.percentiles[quantile].value()
+
+class MetricTracker:
+    """RunningStats per device and metric, fed one sample at a time"""
+
+    def __init__(self, fields=("cpu", "memory", "bandwidth"), **stats_options):
+        self.fields = fields
+        self.stats_options = stats_options
+        self.devices = {}  # device -> {metric: RunningStats}
+        self.peaks = {}    # metric -> sample with the highest value so far
+
+    def add(self, sample):
+        device_stats = self.devices.get(sample["device"])
+        if device_stats is None:
+            device_stats = self.devices[sample["device"]] = {
+                field: RunningStats(**self.stats_options) for field in self.fields}
+        for field in self.fields:
+            value = sample[field]
+            device_stats[field].add(value)
+            peak = self.peaks.get(field)
+            if peak is None or value > peak[field]:
+                self.peaks[field] = sample
+
+    def add_many(self, samples):
+        for sample in samples:
+            self.add(sample)
+        return self
+
+    def stats(self, device, metric):
+        device_stats = self.devices.get(device)
+        return device_stats[metric] if device_stats else None
+
+    def total(self, metric):
+        return sum(device_stats[metric].total for device_stats in self.devices.values())
+
+    def mean(self, metric, device=None):
+        groups = [self.devices[device]] if device is not None else self.devices.values()
+        count = sum(stats[metric].count for stats in groups)
+        return sum(stats[metric].total for stats in groups) / count if count else 0
+
+    def peak(self, metric):
+        return self.peaks.get(metric)
+
+    def health_score(self, device=None):
+        """Same score as calculate_health_score, for one device or all of them"""
+        if not self.devices or (device is not None and device not in self.devices):
+            return 0
+        cpu_health = 100 - self.mean("cpu", device)
+        memory_health = 100 - self.mean("memory", device)
+        return round((cpu_health * 0.5) + (memory_health * 0.5), 2)
+
+tracker = MetricTracker().add_many(performance_data)
+assert calculate_average_cpu(tracker, "CORE-SW-01") == avg_cpu_core, "Fix this: is the running average the same?"
+assert calculate_total_bandwidth(tracker) == 1740, "Fix this: what is total bandwidth?"
+assert find_peak_bandwidth(tracker)["device"] == "CORE-SW-01", "Fix this: which device had peak bandwidth?"
+assert tracker.health_score("CORE-SW-01") == health, "Fix this: is the running health score the same?"
+assert calculate_health_score(tracker) == calculate_health_score(performance_data), "Fix this: and for all devices?"
+
+core_cpu_stats = tracker.stats("CORE-SW-01", "cpu")
+assert (core_cpu_stats.minimum, core_cpu_stats.maximum, core_cpu_stats.last) == (42, 85, 42), "Fix this: min, max and last CPU?"
+assert round(core_cpu_stats.variance, 2) == 576.33, "Fix this: what is the variance of the CPU samples?"
+assert core_cpu_stats.ewma == 52.5, "Fix this: what is the EWMA (alpha 0.3) of 45, 85, 42?"
+
+latency = RunningStats(percentiles=(0.5, 0.99))
+for value in range(1, 501):
+    latency.add(value)
+assert abs(latency.percentile(0.5) - 250) < 10, "Fix this: roughly what is the median of 1..500?"
+assert abs(latency.percentile(0.99) - 495) < 10, "Fix this: roughly what is the 99th percentile?"
+
+# Sliding-window anomaly detection
+# generate_alert fires for every single sample above 80%, so a CPU that sits
+# at 90% for an hour floods the team with alerts, and a one-sample spike
+# alerts too. AnomalyDetector keeps a small state per device and alerts when:
+# - the value stays above a threshold for some samples or seconds (sustained)
+# - the value rises faster than max_rise per minute (rate of change)
+# - the value is more than z_limit standard deviations away from the last
+#   `window` samples (z-score)
+# An alert fires once when a rule becomes true and not again until the rule
+# has been false in between, and never more often than once per cooldown. A
+# rule that becomes true during the cooldown alerts when the cooldown is over,
+# if it is still true then.
+from collections import deque
+
+class DeviceWindow:
+    """Detector state for one device; a fixed amount of memory per device"""
+
+    __slots__ = ("values", "mean", "squares", "above_count", "above_since",
+                 "previous", "active", "waiting", "last_alert")
+
+    def __init__(self, window):
+        self.values = deque(maxlen=window)  # the last `window` values, for the z-score
+        self.mean = 0.0     # Welford's mean and sum of squared differences of values,
+        self.squares = 0.0  # which stay accurate for large values like bandwidth in bit/s
+        self.above_count = 0      # samples in a row above the threshold
+        self.above_since = None   # epoch of the first of them
+        self.previous = None      # (epoch, value) of the sample before
+        self.active = set()       # rules that are true and have been reported
+        self.waiting = set()      # rules that are true but held back by the cooldown
+        self.last_alert = {}      # rule -> epoch of its last alert
+
+    def push(self, value):
+        """Add a value to the window, dropping the oldest one when it is full"""
+        values = self.values
+        if len(values) == values.maxlen:
+            old = values[0]
+            if len(values) == 1:
+                self.mean = self.squares = 0.0
+            else:
+                # Welford's update run backwards removes a value
+                delta = old - self.mean
+                self.mean -= delta / (len(values) - 1)
+                self.squares -= delta * (old - self.mean)
+        values.append(value)
+        delta = value - self.mean
+        self.mean += delta / len(values)
+        self.squares += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """Population variance of the window"""
+        return max(self.squares, 0.0) / len(self.values) if self.values else 0.0
+
+class AnomalyDetector:
+    """Streaming anomaly detection for one metric, per device"""
+
+    def __init__(self, metric="cpu", threshold=80, sustained_samples=1, sustained_seconds=0,
+                 max_rise=None, z_limit=None, window=30, cooldown=600, epoch_of=None):
+        self.metric = metric
+        self.threshold = threshold  # None turns the threshold rule off
+        self.sustained_samples = sustained_samples
+        self.sustained_seconds = sustained_seconds
+        self.max_rise = max_rise
+        self.z_limit = z_limit
+        self.window = window
+        self.cooldown = cooldown
+        self.epoch_of = epoch_of    # epoch_of(sample), by default sample["epoch"]
+        self.devices = {}
+        self.suppressed = 0         # alerts not sent because of the cooldown
+
+    def _rule(self, state, rule, active, sample, epoch, severity, message):
+        if not active:
+            state.active.discard(rule)
+            state.waiting.discard(rule)
+            return None
+        if rule in state.active:
+            return None  # still the same problem, already reported
+        if epoch - state.last_alert.get(rule, epoch - self.cooldown) < self.cooldown:
+            # Not reported yet: if the rule is still true when the cooldown
+            # is over, that sample alerts. Count each held-back problem once.
+            if rule not in state.waiting:
+                state.waiting.add(rule)
+                self.suppressed += 1
+            return None
+        state.waiting.discard(rule)
+        state.active.add(rule)
+        state.last_alert[rule] = epoch
+        return {"device": sample["device"], "severity": severity, "rule": rule,
+                "message": message, "timestamp": sample.get("timestamp", format_epoch(epoch))}
+
+    def check(self, sample):
+        """Feed one sample; returns the list of alerts it causes (usually empty)"""
+        epoch = sample["epoch"] if self.epoch_of is None else self.epoch_of(sample)
+        value = sample[self.metric]
+        state = self.devices.get(sample["device"])
+        if state is None:
+            state = self.devices[sample["device"]] = DeviceWindow(self.window)
+        alerts = []
+
+        if self.threshold is not None:
+            if value > self.threshold:
+                if state.above_count == 0:
+                    state.above_since = epoch
+                state.above_count += 1
+            else:
+                state.above_count = 0
+            sustained = (state.above_count >= self.sustained_samples
+                         and epoch - state.above_since >= self.sustained_seconds)
+            alerts.append(self._rule(state, "sustained", sustained, sample, epoch, "CRITICAL",
+                                     f"{self.metric} above {self.threshold} for {state.above_count} samples"))
+
+        if self.max_rise is not None:
+            rising = False
+            if state.previous is not None and epoch > state.previous[0]:
+                rise = (value - state.previous[1]) * 60 / (epoch - state.previous[0])
+                rising = rise > self.max_rise
+            alerts.append(self._rule(state, "rate", rising, sample, epoch, "WARNING",
+                                     f"{self.metric} rising fast, now {value}"))
+            state.previous = (epoch, value)
+
+        if self.z_limit is not None:
+            unusual = False
+            if len(state.values) >= 5:
+                variance = state.variance
+                if variance > 1e-9:
+                    unusual = abs(value - state.mean) > self.z_limit * variance ** 0.5
+            alerts.append(self._rule(state, "zscore", unusual, sample, epoch, "WARNING",
+                                     f"{self.metric} {value} is unusual for this device"))
+            state.push(value)
+
+        return [alert for alert in alerts if alert is not None]
+
+    def check_many(self, samples):
+        """All alerts for a stream of samples, as a generator"""
+        for sample in samples:
+            yield from self.check(sample)
+
+def minute_samples(device, cpu_values, start="2025-10-07 10:00:00"):
+    """One sample per minute with the given CPU values"""
+    first = timestamp_to_epoch(start)
+    return [{"device": device, "epoch": first + 60 * minute, "cpu": cpu} for minute, cpu in enumerate(cpu_values)]
+
+spiky = minute_samples("CORE-SW-01", [50, 85, 50, 85, 86, 87, 88, 40])
+assert len(find_high_cpu_events(spiky)) == 5, "Fix this: how many samples are above 80?"
+
+sustained_alerts = list(AnomalyDetector(sustained_samples=3).check_many(spiky))
+assert len(sustained_alerts) == 1, "Fix this: how many alerts for CPU above 80 three samples in a row?"
+assert sustained_alerts[0]["timestamp"] == "2025-10-07 10:05:00", "Fix this: when does it fire?"
+
+rise_alerts = list(AnomalyDetector(threshold=None, max_rise=20, cooldown=0).check_many(spiky))
+assert [alert["rule"] for alert in rise_alerts] == ["rate", "rate"], "Fix this: how many fast rises?"
+
+flapping = AnomalyDetector(sustained_samples=2, cooldown=600)
+flapping_alerts = list(flapping.check_many(minute_samples("FW-01", [90, 90, 10, 90, 90, 10])))
+assert (len(flapping_alerts), flapping.suppressed) == (1, 1), "Fix this: how many alerts were sent and suppressed?"
+
+# A problem that starts during the cooldown is reported once the cooldown is over
+stuck = AnomalyDetector(sustained_samples=2, cooldown=600)
+stuck_alerts = list(stuck.check_many(minute_samples("FW-01", [90, 90, 10] + [90] * 120)))
+assert [alert["timestamp"] for alert in stuck_alerts] == ["2025-10-07 10:01:00", "2025-10-07 10:11:00"], "Fix this: when are the alerts sent?"
+assert stuck.suppressed == 1, "Fix this: how many problems were held back?"
+
+steady = minute_samples("DIST-SW-01", [40, 41, 39, 40, 42, 38, 40, 41, 39, 75])
+z_alerts = list(AnomalyDetector(threshold=None, z_limit=3).check_many(steady))
+assert len(z_alerts) == 1 and z_alerts[0]["message"].startswith("cpu 75"), "Fix this: which sample is unusual?"
+
+# The window statistics stay exact for big numbers such as bandwidth in bit/s
+bandwidth_window = DeviceWindow(30)
+for step in range(1000):
+    bandwidth_window.push(1e9 + step % 7 * 100_000 + step * 0.001)
+exact = RunningStats()
+for value in bandwidth_window.values:
+    exact.add(value)
+assert abs(bandwidth_window.variance - exact.variance * 29 / 30) < 1e-3 * exact.variance, "Fix this: is the window variance right?"
+
 # Log summary by hour
 def summarize_logs_by_hour(logs):
     summary = {}
@@ -226,7 +1013,8 @@ def summarize_logs_by_hour(logs):
         hour = log["timestamp"].split(":")[0] + ":00"  # Get hour
         if hour not in summary:
             summary[hour] = {"INFO": 0, "WARNING": 0, "ERROR": 0}
-        summary[hour][log["level"]] += 1
+        # Other levels (DEBUG, NOTICE, ...) are counted too instead of raising KeyError
+        summary[hour][log["level"]] = summary[hour].get(log["level"], 0) + 1
     return summary
 
 summary = summarize_logs_by_hour(parsed_logs)
@@ -234,4 +1022,361 @@ assert len(summary) == 1, "Fix this: how many hours in summary?"
 # All logs are from 09:xx so should be 1 hour
 assert "2025-10-07 09:00" in summary, "Fix this: summary should have the hour key"
 
+# Rollups over any interval
+# A rollup counts logs per (time bucket, device, level) and summarizes metrics
+# per (time bucket, device, metric). The bucket is the epoch rounded down to
+# the interval, so it is plain integer arithmetic instead of string handling.
+# Rollups from several workers (e.g. one per log file) can be merged.
+INTERVALS = {"1s": 1, "1m": 60, "5m": 300, "15m": 900, "1h": 3600, "1d": 86400}
+
+class Rollup:
+    """Log counts and metric statistics per time bucket, updated as records stream in"""
+
+    def __init__(self, interval="1h"):
+        self.interval = INTERVALS[interval] if isinstance(interval, str) else interval
+        self.logs = Counter()  # (bucket, device, level code) -> count
+        self.metrics = {}      # (bucket, device, metric) -> [count, total, minimum, maximum]
+
+    def bucket(self, epoch):
+        return epoch - epoch % self.interval
+
+    def add_logs(self, records):
+        """Count LogRecords; returns self so calls can be chained"""
+        logs, interval = self.logs, self.interval
+        for record in records:
+            logs[record.epoch - record.epoch % interval, record.device, record.level] += 1
+        return self
+
+    def add_metric(self, epoch, device, metric, value):
+        key = (epoch - epoch % self.interval, device, metric)
+        stats = self.metrics.get(key)
+        if stats is None:
+            self.metrics[key] = [1, value, value, value]
+        else:
+            stats[0] += 1
+            stats[1] += value
+            if value < stats[2]:
+                stats[2] = value
+            if value > stats[3]:
+                stats[3] = value
+
+    def add_metrics(self, metrics, fields=("cpu", "memory", "bandwidth"), epoch_of=None):
+        """Add metric dicts; epoch_of(metric) gives the time, by default metric["epoch"]"""
+        for metric in metrics:
+            epoch = metric["epoch"] if epoch_of is None else epoch_of(metric)
+            for field in fields:
+                self.add_metric(epoch, metric["device"], field, metric[field])
+        return self
+
+    def merge(self, other):
+        """Add the counts of another rollup with the same interval"""
+        if other.interval != self.interval:
+            raise ValueError(f"Cannot merge a {other.interval}s rollup into a {self.interval}s rollup")
+        self.logs.update(other.logs)
+        for key, stats in other.metrics.items():
+            self._merge_stats(key, stats)
+        return self
+
+    def _merge_stats(self, key, other):
+        stats = self.metrics.get(key)
+        if stats is None:
+            self.metrics[key] = list(other)
+        else:
+            stats[0] += other[0]
+            stats[1] += other[1]
+            stats[2] = min(stats[2], other[2])
+            stats[3] = max(stats[3], other[3])
+
+    def coarsen(self, interval):
+        """A new rollup with a longer interval (a multiple of this one), e.g. 5m -> 1h"""
+        coarse = Rollup(interval)
+        if coarse.interval % self.interval:
+            raise ValueError(f"{coarse.interval}s is not a multiple of {self.interval}s")
+        for (bucket, device, level), count in self.logs.items():
+            coarse.logs[coarse.bucket(bucket), device, level] += count
+        for (bucket, device, metric), stats in self.metrics.items():
+            coarse._merge_stats((coarse.bucket(bucket), device, metric), stats)
+        return coarse
+
+    def export(self):
+        """Plain data (level names instead of codes) that can be pickled or sent to another process"""
+        return {
+            "interval": self.interval,
+            "logs": [(bucket, device, LEVELS[level], count) for (bucket, device, level), count in self.logs.items()],
+            "metrics": [(*key, *stats) for key, stats in self.metrics.items()],
+        }
+
+    @classmethod
+    def from_export(cls, data):
+        rollup = cls(data["interval"])
+        for bucket, device, level, count in data["logs"]:
+            rollup.logs[bucket, device, level_code(level)] += count
+        for bucket, device, metric, *stats in data["metrics"]:
+            rollup.metrics[bucket, device, metric] = stats
+        return rollup
+
+    def level_counts(self):
+        """{bucket: {level name: count}}, oldest bucket first"""
+        result = {}
+        for (bucket, device, level), count in sorted(self.logs.items()):
+            counts = result.setdefault(bucket, {})
+            counts[LEVELS[level]] = counts.get(LEVELS[level], 0) + count
+        return result
+
+    def total(self, device=None, level=None, since=None, until=None):
+        """Number of logs, optionally only for a device, a level and/or a time range"""
+        code = None if level is None else LEVEL_CODES.get(level)
+        if level is not None and code is None:
+            return 0  # a level that was never logged
+        return sum(count for (bucket, other_device, other_level), count in self.logs.items()
+                   if (device is None or other_device == device)
+                   and (code is None or other_level == code)
+                   and (since is None or bucket >= since)
+                   and (until is None or bucket < until))
+
+    def metric_summary(self, device, metric):
+        """{bucket: (count, average, minimum, maximum)} for one device and metric"""
+        return {bucket: (count, total / count, minimum, maximum)
+                for (bucket, other_device, other_metric), (count, total, minimum, maximum) in sorted(self.metrics.items())
+                if other_device == device and other_metric == metric}
+
+assert summarize_logs_by_hour(records)["2025-10-07 10:00"]["NOTICE"] == 1, "Fix this: how many NOTICE logs at 10:00?"
+
+hourly = Rollup("1h").add_logs(records)
+ten_o_clock = timestamp_to_epoch("2025-10-07 10:00:00")
+assert len(hourly.level_counts()) == 2, "Fix this: how many hours have logs?"
+assert hourly.level_counts()[ten_o_clock] == {"NOTICE": 1}, "Fix this: what was logged at 10:00?"
+assert hourly.total(device="DIST-SW-01", level="ERROR") == 2, "Fix this: how many errors from DIST-SW-01?"
+assert hourly.total(level="ALERT") == 0 and "ALERT" not in LEVEL_CODES, "Fix this: how many ALERT logs, and is ALERT a level now?"
+
+five_minutes = Rollup("5m").add_logs(parse_log_records(network_logs))
+buckets = [format_epoch(bucket) for bucket in five_minutes.level_counts()]
+assert buckets == ["2025-10-07 09:15:00", "2025-10-07 09:20:00"], "Fix this: which 5 minute buckets have logs?"
+assert five_minutes.total(since=timestamp_to_epoch("2025-10-07 09:20:00")) == 2, "Fix this: how many logs from 09:20?"
+assert five_minutes.coarsen("1h").total() == 7, "Fix this: how many logs in the hourly rollup?"
+
+# Two workers each roll up half of the logs, then the results are merged
+first_half = Rollup("5m").add_logs(parse_log_records(network_logs[:4]))
+second_half = Rollup.from_export(Rollup("5m").add_logs(parse_log_records(network_logs[4:])).export())
+assert first_half.merge(second_half).logs == five_minutes.logs, "Fix this: is the merged rollup the same?"
+
+metric_rollup = Rollup("1h").add_metrics(performance_data, epoch_of=lambda m: timestamp_to_epoch(f"2025-10-07 {m['timestamp']}:00"))
+core_cpu = metric_rollup.metric_summary("CORE-SW-01", "cpu")[timestamp_to_epoch("2025-10-07 09:00:00")]
+assert core_cpu == (3, 57.333333333333336, 42, 85), "Fix this: count, average, min and max CPU for CORE-SW-01?"
+
+# Metric time-series store
+# A list of dicts with "HH:MM" strings uses hundreds of bytes per sample and
+# has to be scanned for every question. MetricStore keeps each device's
+# samples in contiguous typed columns instead: epoch seconds as 64-bit
+# integers and every metric as 64-bit floats, 8 bytes per value. Samples are
+# kept in time order, so a time range is found with a binary search. The
+# columns can be saved to files and memory-mapped again, so the operating
+# system only loads the parts that are actually read.
+import os
+import json
+import mmap
+from array import array
+from bisect import bisect_left
+from itertools import groupby
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class TimeSeries:
+    """Timestamps plus one column per metric for a single device"""
+
+    __slots__ = ("times", "columns")
+
+    def __init__(self, fields):
+        self.times = array("q")
+        self.columns = {field: array("d") for field in fields}
+
+DOWNSAMPLE_FUNCTIONS = {
+    "mean": lambda values: sum(values) / len(values),
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "last": lambda values: values[-1],
+}
+
+class MetricStore:
+    """
+    Metric samples per device in typed columns: array.array in memory, or
+    memory-mapped files after open(). Aggregates use NumPy on the same
+    memory when it is installed, and plain Python otherwise.
+    """
+
+    def __init__(self, fields=("cpu", "memory", "bandwidth")):
+        self.fields = tuple(fields)
+        self.series = {}  # device -> TimeSeries
+        self.read_only = False
+        self._mmaps = []
+
+    def append(self, device, epoch, values):
+        """Add one sample; values maps every field to a number"""
+        if self.read_only:
+            raise ValueError("A memory-mapped store is read-only")
+        # Convert everything first: a missing field or a bad value raises
+        # here, before any column has grown, so the columns stay the same length
+        row = array("d", [values[field] for field in self.fields])
+        stamp = array("q", [epoch])
+        series = self.series.get(device)
+        if series is not None and series.times and epoch < series.times[-1]:
+            raise ValueError(f"{device}: samples must be added in time order")
+        if series is None:
+            series = self.series[device] = TimeSeries(self.fields)
+        series.times.extend(stamp)
+        for field, value in zip(self.fields, row):
+            series.columns[field].append(value)
+
+    def add_samples(self, samples, epoch_of=None):
+        """Add metric dicts; epoch_of(sample) gives the time, by default sample["epoch"]"""
+        for sample in samples:
+            self.append(sample["device"], sample["epoch"] if epoch_of is None else epoch_of(sample), sample)
+        return self
+
+    def _slice(self, device, field, start, end):
+        """Times and values with start <= time < end (binary search on the times)"""
+        series = self.series[device]
+        times = series.times
+        low = 0 if start is None else bisect_left(times, start)
+        high = len(times) if end is None else bisect_left(times, end)
+        return times[low:high], series.columns[field][low:high]
+
+    def range(self, device, field, start=None, end=None):
+        """(times, values) as new arrays, with start <= time < end"""
+        times, values = self._slice(device, field, start, end)
+        copied_times, copied_values = array("q"), array("d")
+        copied_times.frombytes(memoryview(times).cast("B"))  # frombytes() only takes plain bytes
+        copied_values.frombytes(memoryview(values).cast("B"))
+        return copied_times, copied_values
+
+    def aggregate(self, device, field, start=None, end=None):
+        """count, sum, mean, min, max and (population) stdev of a metric over a time range"""
+        values = self._slice(device, field, start, end)[1]
+        count = len(values)
+        if not count:
+            return {"count": 0, "sum": 0, "mean": None, "min": None, "max": None, "stdev": None}
+        if np is not None:
+            data = np.frombuffer(values, dtype="d")
+            result = {"sum": float(data.sum()), "min": float(data.min()),
+                      "max": float(data.max()), "stdev": float(data.std())}
+        else:
+            total = sum(values)
+            mean = total / count
+            result = {"sum": total, "min": min(values), "max": max(values),
+                      "stdev": (sum((value - mean) ** 2 for value in values) / count) ** 0.5}
+        result["count"] = count
+        result["mean"] = result["sum"] / count
+        return result
+
+    def downsample(self, device, field, interval, how="mean", start=None, end=None):
+        """[(bucket start, value)] with one value per interval seconds: mean, min, max, sum or last"""
+        times, values = self._slice(device, field, start, end)
+        if not len(times):
+            return []
+        if np is None:
+            samples = groupby(zip(times, values), key=lambda sample: sample[0] - sample[0] % interval)
+            reduce = DOWNSAMPLE_FUNCTIONS[how]
+            return [(bucket, reduce([value for _, value in group])) for bucket, group in samples]
+        times = np.frombuffer(times, dtype="q")
+        values = np.frombuffer(values, dtype="d")
+        buckets = times - times % interval
+        # Times are sorted, so each bucket is one run; starts = first index of every run
+        starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+        if how == "last":
+            result = values[np.append(starts[1:], len(values)) - 1]
+        elif how == "mean":
+            result = np.add.reduceat(values, starts) / np.diff(np.append(starts, len(values)))
+        else:
+            result = {"min": np.minimum, "max": np.maximum, "sum": np.add}[how].reduceat(values, starts)
+        return list(zip(buckets[starts].tolist(), result.tolist()))
+
+    def save(self, directory):
+        """Write every column as a raw binary file plus a small JSON header"""
+        os.makedirs(directory, exist_ok=True)
+        header = {"fields": list(self.fields), "byteorder": sys.byteorder, "devices": []}
+        for number, (device, series) in enumerate(self.series.items()):
+            header["devices"].append(device)
+            for name, column in [("time", series.times), *series.columns.items()]:
+                with open(os.path.join(directory, f"{number}.{name}.bin"), "wb") as column_file:
+                    column_file.write(column)
+        with open(os.path.join(directory, "store.json"), "w") as header_file:
+            json.dump(header, header_file)
+
+    @classmethod
+    def open(cls, directory):
+        """Open a saved store read-only, with the columns memory-mapped instead of loaded"""
+        with open(os.path.join(directory, "store.json")) as header_file:
+            header = json.load(header_file)
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"Store was saved on a {header['byteorder']}-endian machine")
+        store = cls(header["fields"])
+        store.read_only = True
+        for number, device in enumerate(header["devices"]):
+            series = store.series[device] = TimeSeries(())
+            series.times = store._map(os.path.join(directory, f"{number}.time.bin"), "q")
+            for field in store.fields:
+                series.columns[field] = store._map(os.path.join(directory, f"{number}.{field}.bin"), "d")
+        return store
+
+    def _map(self, path, typecode):
+        with open(path, "rb") as column_file:
+            if os.fstat(column_file.fileno()).st_size == 0:
+                return array(typecode)  # an empty file cannot be mapped
+            mapped = mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmaps.append(mapped)
+        return memoryview(mapped).cast(typecode)
+
+    def close(self):
+        """Release the memory maps of an opened store"""
+        for series in self.series.values():
+            for column in (series.times, *series.columns.values()):
+                if isinstance(column, memoryview):
+                    column.release()
+        for mapped in self._mmaps:
+            mapped.close()
+        self.series = {}
+        self._mmaps = []
+
+def performance_epoch(metric):
+    return timestamp_to_epoch(f"2025-10-07 {metric['timestamp']}:00")
+
+store = MetricStore().add_samples(performance_data, epoch_of=performance_epoch)
+nine = timestamp_to_epoch("2025-10-07 09:00:00")
+core_cpu_total = store.aggregate("CORE-SW-01", "cpu")
+assert (core_cpu_total["count"], core_cpu_total["sum"], core_cpu_total["max"]) == (3, 172, 85), "Fix this: count, sum and max CPU?"
+assert list(store.range("CORE-SW-01", "cpu", nine + 15 * 60, nine + 60 * 60)[1]) == [85, 42], "Fix this: CPU from 09:15?"
+assert store.downsample("CORE-SW-01", "cpu", 30 * 60, "max") == [(nine, 85), (nine + 1800, 42)], "Fix this: max CPU per half hour?"
+assert store.aggregate("DIST-SW-01", "bandwidth", start=nine + 10 * 60)["sum"] == 210, "Fix this: DIST-SW-01 bandwidth after 09:10?"
+
+try:
+    store.append("CORE-SW-01", nine, {"cpu": 1, "memory": 1, "bandwidth": 1})
+    out_of_order_accepted = True
+except ValueError:
+    out_of_order_accepted = False
+assert out_of_order_accepted == False, "Fix this: can a sample older than the last one be added?"
+
+for device, bad_values in [("X", {"cpu": 1}), ("CORE-SW-01", {"cpu": 1, "memory": "high", "bandwidth": 1})]:
+    try:
+        store.append(device, nine + 7200, bad_values)
+        bad_sample_accepted = True
+    except (KeyError, TypeError):
+        bad_sample_accepted = False
+    assert bad_sample_accepted == False, "Fix this: can a sample with a missing or bad value be added?"
+assert "X" not in store.series, "Fix this: did the failed sample create a device?"
+assert [len(column) for column in store.series["CORE-SW-01"].columns.values()] == [3, 3, 3], "Fix this: did any column grow?"
+assert len(store.series["CORE-SW-01"].times) == 3, "Fix this: did the times grow?"
+
+import tempfile
+
+with tempfile.TemporaryDirectory() as store_directory:
+    store.save(store_directory)
+    mapped_store = MetricStore.open(store_directory)
+    assert mapped_store.aggregate("CORE-SW-01", "cpu") == core_cpu_total, "Fix this: is the memory-mapped data the same?"
+    assert mapped_store.downsample("DIST-SW-01", "memory", 3600) == [(nine, 56)], "Fix this: average memory for DIST-SW-01?"
+    mapped_store.close()
+
 print("✓ Network Koan 3 completed! You can monitor and analyze network performance.")
@@ -5,12 +5,23 @@ Tests the runner logic without running actual koans
 
 import unittest
 import sys
+import os
+import io
+import tempfile
+import json
+from contextlib import redirect_stdout
+from unittest import mock
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from run_koans import run_koan
+import run_koans
+from run_koans import (
+    run_koan, run_koan_captured, compile_koan, main,
+    PollingWatcher, InotifyWatcher, watch_koans,
+    run_koan_supervised, KoanLimits,
+)
 
 
 class TestKoanRunner(unittest.TestCase):
@@ -118,5 +129,365 @@ class TestSolvedKoansPass(unittest.TestCase):
                 self.assertTrue(passed, f"{koan_file.name} should pass: {message}")
 
 
+class TestCompileCache(unittest.TestCase):
+    """Test the in-memory and on-disk compile cache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+        self.koan = Path(self.temp_dir.name) / "01_cached.py"
+        self.koan.write_text("assert 1 + 1 == 2")
+        run_koans._code_cache.clear()
+
+    def tearDown(self):
+        run_koans._code_cache.clear()
+        self.temp_dir.cleanup()
+
+    def test_unchanged_koan_is_compiled_once(self):
+        """Test that a second load reuses the compiled code object"""
+        first, digest = compile_koan(self.koan)
+        second, second_digest = compile_koan(self.koan)
+
+        self.assertIs(first, second)
+        self.assertEqual(digest, second_digest)
+
+    def test_disk_cache_is_used_by_a_new_run(self):
+        """Test that the marshal cache skips compiling in a fresh process"""
+        compile_koan(self.koan, self.cache_dir)
+        run_koans._code_cache.clear()
+
+        with mock.patch("run_koans.compile", create=True) as fake_compile:
+            passed, message = run_koan(self.koan, self.cache_dir)
+
+        fake_compile.assert_not_called()
+        self.assertTrue(passed, message)
+
+    def test_changed_koan_is_recompiled(self):
+        """Test that editing a koan invalidates its cached code"""
+        compile_koan(self.koan, self.cache_dir)
+        self.koan.write_text("assert False, 'edited koan'")
+        run_koans._code_cache.clear()
+
+        passed, message = run_koan(self.koan, self.cache_dir)
+
+        self.assertFalse(passed)
+        self.assertIn("edited koan", message)
+
+    def test_touched_koan_reuses_code_by_digest(self):
+        """Test that a new mtime with the same content does not recompile"""
+        first, _ = compile_koan(self.koan, self.cache_dir)
+        stat = self.koan.stat()
+        os.utime(self.koan, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        second, _ = compile_koan(self.koan, self.cache_dir)
+
+        self.assertIs(first, second)
+
+
+class TestKoanStats(unittest.TestCase):
+    """Test the per-koan instrumentation"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.koan = Path(self.temp_dir.name) / "01_measured.py"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stats_are_collected(self):
+        """Test that run_koan fills in every stat"""
+        self.koan.write_text(
+            "import json\n"
+            "data = [0] * 100000\n"
+            "def check(n):\n"
+            "    assert n >= 0, 'negative'\n"
+            "for n in range(5):\n"
+            "    check(n)\n"
+            "assert len(data) == 100000\n"
+        )
+        stats = {}
+        passed, message = run_koan(self.koan, stats=stats)
+
+        self.assertTrue(passed, message)
+        self.assertEqual(stats["assertions"], 6)
+        self.assertGreater(stats["peak_memory"], 100000 * 8 - 1)
+        self.assertGreater(stats["wall_time"], 0)
+        self.assertGreaterEqual(stats["cpu_time"], 0)
+        self.assertGreaterEqual(stats["import_time"], 0)
+
+    def test_stats_are_collected_for_failures(self):
+        """Test that assertions are counted up to the failing one"""
+        self.koan.write_text("assert True\nassert False, 'stop here'\nassert True")
+        stats = {}
+        passed, message = run_koan(self.koan, stats=stats)
+
+        self.assertFalse(passed)
+        self.assertEqual(stats["assertions"], 2)
+
+    def test_instrumentation_keeps_line_numbers(self):
+        """Test that tracebacks still point at the koan's own lines"""
+        self.koan.write_text("x = 1\n\nassert x == 2, 'line three'")
+        code, _ = compile_koan(self.koan)
+
+        try:
+            exec(code, {"__koan_assert__": lambda: None})
+        except AssertionError as e:
+            self.assertEqual(e.__traceback__.tb_next.tb_lineno, 3)
+        else:
+            self.fail("Koan should have raised AssertionError")
+
+
+class TestKoanLimits(unittest.TestCase):
+    """Test timeouts and resource limits for supervised koans"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.koan = Path(self.temp_dir.name) / "01_limited.py"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_supervised_koan_passes(self):
+        """Test that a normal koan gives the same result in a worker"""
+        self.koan.write_text('print("inside worker")\nassert True')
+        passed, message, output, elapsed, stats = run_koan_supervised(
+            self.koan, limits=KoanLimits(timeout=30)
+        )
+
+        self.assertTrue(passed, message)
+        self.assertEqual(output, "inside worker\n")
+
+    def test_endless_koan_times_out(self):
+        """Test that an endless loop is stopped at the timeout"""
+        self.koan.write_text("while True:\n    pass")
+        passed, message, output, elapsed, stats = run_koan_supervised(
+            self.koan, limits=KoanLimits(timeout=0.5)
+        )
+
+        self.assertFalse(passed)
+        self.assertIn("Timed out", message)
+        self.assertLess(elapsed, 10)
+
+    @unittest.skipIf(run_koans.resource is None, "rlimits are not available")
+    def test_memory_limit_stops_koan(self):
+        """Test that a koan allocating too much memory fails with an error"""
+        self.koan.write_text("data = bytearray(2 * 1024 ** 3)")
+        passed, message, output, elapsed, stats = run_koan_supervised(
+            self.koan, limits=KoanLimits(timeout=30, max_memory=512 * 1024 ** 2)
+        )
+
+        self.assertFalse(passed)
+        self.assertIn("Error", message)
+
+
+class TestParallelRunner(unittest.TestCase):
+    """Test the --jobs mode of the runner"""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        self.koan_dir = Path("basic_python")
+        self.koan_dir.mkdir()
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        self.temp_dir.cleanup()
+
+    def write_koan(self, name, code):
+        (self.koan_dir / name).write_text(code)
+
+    def run_main(self, *argv):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = main(["--no-cache", *argv])
+        return exit_code, output.getvalue()
+
+    def test_captured_run_returns_output_and_time(self):
+        """Test that run_koan_captured captures koan output"""
+        self.write_koan("01_hello.py", 'print("hello")\nassert True')
+        passed, message, output, elapsed, stats = run_koan_captured(self.koan_dir / "01_hello.py")
+
+        self.assertTrue(passed, message)
+        self.assertEqual(output, "hello\n")
+        self.assertGreaterEqual(elapsed, 0)
+        self.assertIsNone(stats)
+
+    def test_parallel_run_keeps_order(self):
+        """Test that parallel output is printed in koan order"""
+        for number in range(1, 5):
+            self.write_koan(f"0{number}_koan.py", f'print("output {number}")')
+
+        exit_code, output = self.run_main("--jobs", "3")
+
+        self.assertEqual(exit_code, 0)
+        positions = [output.index(f"output {number}") for number in range(1, 5)]
+        self.assertEqual(positions, sorted(positions))
+        self.assertIn("ms)", output)
+
+    def test_report_and_slowest_table(self):
+        """Test that --report writes JSON stats and --slowest prints a table"""
+        self.write_koan("01_first.py", "assert True")
+        self.write_koan("02_second.py", "assert True\nassert True")
+
+        exit_code, output = self.run_main("--jobs", "2", "--report", "report.json", "--slowest", "1")
+
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Slowest koans", output)
+        with open("report.json", encoding="utf-8") as f:
+            rows = json.load(f)
+        self.assertEqual([row["assertions"] for row in rows], [1, 2])
+        self.assertEqual(rows[0]["status"], "passed")
+
+    def test_timeout_does_not_stall_parallel_run(self):
+        """Test that a hanging koan is reported as timed out with --jobs"""
+        self.write_koan("01_hangs.py", "while True:\n    pass")
+        self.write_koan("02_fine.py", "assert True")
+
+        exit_code, output = self.run_main("--jobs", "2", "--timeout", "0.5")
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Timed out", output)
+
+    def test_parallel_run_stops_at_first_failure(self):
+        """Test that parallel mode reports only up to the first failure"""
+        self.write_koan("01_ok.py", 'print("first")')
+        self.write_koan("02_broken.py", "assert False, 'Broken koan'")
+        self.write_koan("03_after.py", 'print("never shown")')
+
+        exit_code, output = self.run_main("--jobs", "2")
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("first", output)
+        self.assertIn("Broken koan", output)
+        self.assertNotIn("never shown", output)
+
+
+class TestIncrementalRunner(unittest.TestCase):
+    """Test that unchanged, passing koans are skipped using the ledger"""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        self.koan_dir = Path("basic_python")
+        self.koan_dir.mkdir()
+        (self.koan_dir / "01_first.py").write_text('print("first ran")')
+        (self.koan_dir / "02_second.py").write_text('print("second ran")')
+        run_koans._code_cache.clear()
+
+    def tearDown(self):
+        run_koans._code_cache.clear()
+        os.chdir(self.original_cwd)
+        self.temp_dir.cleanup()
+
+    def run_main(self, *argv):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = main(["--cache-dir", "cache", *argv])
+        return exit_code, output.getvalue()
+
+    def test_passed_koans_are_skipped_on_next_run(self):
+        """Test that a second run reports passed koans from the ledger"""
+        self.run_main()
+        exit_code, output = self.run_main()
+
+        self.assertEqual(exit_code, 0)
+        self.assertNotIn("first ran", output)
+        self.assertEqual(output.count("(cached)"), 2)
+
+    def test_changed_koan_runs_again(self):
+        """Test that editing a koan makes it run again"""
+        self.run_main()
+        (self.koan_dir / "02_second.py").write_text('print("second edited")')
+
+        exit_code, output = self.run_main()
+
+        self.assertNotIn("first ran", output)
+        self.assertIn("second edited", output)
+
+    def test_failed_koans_are_not_skipped(self):
+        """Test that a koan recorded as failing is run again"""
+        (self.koan_dir / "02_second.py").write_text("assert False, 'still broken'")
+        self.run_main()
+
+        exit_code, output = self.run_main()
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("still broken", output)
+
+    def test_force_runs_everything(self):
+        """Test that --force ignores the ledger"""
+        self.run_main()
+        exit_code, output = self.run_main("--force")
+
+        self.assertIn("first ran", output)
+        self.assertIn("second ran", output)
+        self.assertNotIn("(cached)", output)
+
+
+class FakeWatcher:
+    """Watcher that reports prepared changes, then simulates Ctrl+C"""
+
+    def __init__(self, changes):
+        self.changes = list(changes)
+        self.closed = False
+
+    def wait(self):
+        if not self.changes:
+            raise KeyboardInterrupt
+        return self.changes.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+class TestWatchMode(unittest.TestCase):
+    """Test watch mode and the file watchers"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.koan_dir = Path(self.temp_dir.name) / "basic_python"
+        self.koan_dir.mkdir()
+        self.koan = self.koan_dir / "01_watched.py"
+        self.koan.write_text('print("version 1")')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_watch_reruns_only_changed_koans(self):
+        """Test that watch mode runs the changed koans it is told about"""
+        other = self.koan_dir / "02_untouched.py"
+        other.write_text('print("untouched")')
+        watcher = FakeWatcher([{self.koan}])
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = watch_koans(watcher, [str(self.koan_dir)])
+
+        self.assertEqual(exit_code, 0)
+        self.assertTrue(watcher.closed)
+        self.assertIn("version 1", output.getvalue())
+        self.assertNotIn("untouched", output.getvalue())
+
+    def test_polling_watcher_detects_change(self):
+        """Test that the mtime poller reports an edited koan"""
+        watcher = PollingWatcher([str(self.koan_dir)], interval=0.01)
+        stat = self.koan.stat()
+        os.utime(self.koan, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertEqual(watcher.wait(), {self.koan})
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_watcher_detects_change(self):
+        """Test that the inotify watcher reports a saved koan"""
+        watcher = InotifyWatcher([str(self.koan_dir)], settle=0.01)
+        try:
+            self.koan.write_text('print("version 2")')
+            self.assertEqual(watcher.wait(), {self.koan})
+        finally:
+            watcher.close()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,8 +5,113 @@ Tests that all solved versions work correctly and teach the right concepts
 
 import unittest
 from pathlib import Path
+from contextlib import redirect_stdout, redirect_stderr
+import multiprocessing
 import subprocess
+import traceback
+import tempfile
+import random
+import runpy
 import sys
+import io
+import os
+
+# Environment variable selecting how solved koans are executed
+BACKEND_ENV = "KOAN_TEST_BACKEND"
+DEFAULT_BACKEND = "subprocess"
+
+
+def run_koan_subprocess(koan_path):
+    """Run a koan as a standalone script in a new interpreter"""
+    return subprocess.run(
+        [sys.executable, str(koan_path)],
+        capture_output=True,
+        text=True
+    )
+
+
+def run_koan_in_process(koan_path):
+    """
+    Run a koan as __main__ in this interpreter, isolated like a script run.
+
+    Output is captured, and sys.modules, sys.argv, sys.path and the random
+    module state are restored afterwards. Returns a CompletedProcess just
+    like run_koan_subprocess.
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_modules = dict(sys.modules)
+    saved_argv = sys.argv[:]
+    saved_path = sys.path[:]
+    saved_random = random.getstate()
+    returncode = 0
+
+    sys.argv = [str(koan_path)]
+    sys.path.insert(0, str(Path(koan_path).parent))
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                runpy.run_path(str(koan_path), run_name="__main__")
+            except SystemExit as e:
+                if isinstance(e.code, int) or e.code is None:
+                    returncode = e.code or 0
+                else:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        for name in set(sys.modules) - set(saved_modules):
+            del sys.modules[name]
+        sys.modules.update(saved_modules)
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        random.setstate(saved_random)
+
+    return subprocess.CompletedProcess(
+        [sys.executable, str(koan_path)], returncode, stdout.getvalue(), stderr.getvalue()
+    )
+
+
+_worker_pool = None
+
+
+def run_koan_in_pool(koan_path):
+    """Run a koan in-process inside a reusable (forked where possible) worker"""
+    global _worker_pool
+    if _worker_pool is None:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        _worker_pool = context.Pool(processes=min(4, os.cpu_count() or 1))
+    return _worker_pool.apply(run_koan_in_process, (koan_path,))
+
+
+def close_worker_pool():
+    """Shut down the worker pool used by the pool backend"""
+    global _worker_pool
+    if _worker_pool is not None:
+        _worker_pool.close()
+        _worker_pool.join()
+        _worker_pool = None
+
+
+KOAN_BACKENDS = {
+    "subprocess": run_koan_subprocess,
+    "inprocess": run_koan_in_process,
+    "pool": run_koan_in_pool,
+}
+
+
+def get_backend(name=None):
+    """Return the koan runner selected by name or by KOAN_TEST_BACKEND"""
+    name = name or os.environ.get(BACKEND_ENV, DEFAULT_BACKEND)
+    if name not in KOAN_BACKENDS:
+        raise ValueError(f"Unknown koan backend {name!r}, choose from {', '.join(KOAN_BACKENDS)}")
+    return KOAN_BACKENDS[name]
+
+
+def tearDownModule():
+    close_worker_pool()
 
 
 class TestSolvedKoansIntegration(unittest.TestCase):
@@ -14,16 +119,11 @@ class TestSolvedKoansIntegration(unittest.TestCase):
 
     def setUp(self):
         self.solved_dir = Path(__file__).parent / "solved_koans"
-        self.python = sys.executable
+        self.run_koan = get_backend()
 
     def run_koan_as_script(self, koan_path):
-        """Run a koan as a standalone script"""
-        result = subprocess.run(
-            [self.python, str(koan_path)],
-            capture_output=True,
-            text=True
-        )
-        return result
+        """Run a koan as a standalone script (using the selected backend)"""
+        return self.run_koan(koan_path)
 
     def test_basic_python_01_runs_successfully(self):
         """Test that solved koan 01 runs without errors"""
@@ -89,6 +189,65 @@ class TestSolvedKoansIntegration(unittest.TestCase):
                 )
 
 
+class TestExecutionBackends(unittest.TestCase):
+    """Test that the faster backends behave like a script run"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.koan_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_koan(self, name, code):
+        koan = self.koan_dir / name
+        koan.write_text(code)
+        return koan
+
+    def test_in_process_captures_output(self):
+        """Test that in-process runs capture stdout and report success"""
+        koan = self.write_koan("01_ok.py", 'print("✓ done")\nassert __name__ == "__main__"')
+        result = run_koan_in_process(koan)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, "✓ done\n")
+
+    def test_in_process_reports_failures(self):
+        """Test that a failing koan gives a non-zero code and a traceback"""
+        koan = self.write_koan("02_broken.py", "assert False, 'broken koan'")
+        result = run_koan_in_process(koan)
+
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("AssertionError: broken koan", result.stderr)
+
+    def test_in_process_restores_interpreter_state(self):
+        """Test that imports and random state do not leak between koans"""
+        koan = self.write_koan("03_state.py", "import xml.dom.minidom\nimport random\nrandom.seed(1)\nrandom.random()")
+        sys.modules.pop("xml.dom.minidom", None)
+        state = random.getstate()
+
+        run_koan_in_process(koan)
+
+        self.assertNotIn("xml.dom.minidom", sys.modules)
+        self.assertEqual(random.getstate(), state)
+
+    def test_backends_agree_on_solved_koan(self):
+        """Test that all backends give the same result for a solved koan"""
+        koan = Path(__file__).parent / "solved_koans" / "basic_python" / "01_variables_and_strings.py"
+        expected = run_koan_subprocess(koan)
+
+        for name in KOAN_BACKENDS:
+            with self.subTest(backend=name):
+                result = get_backend(name)(koan)
+                self.assertEqual(result.returncode, expected.returncode)
+                self.assertEqual(result.stdout, expected.stdout)
+
+    def test_unknown_backend_is_rejected(self):
+        """Test that a misspelled backend name fails loudly"""
+        with self.assertRaises(ValueError):
+            get_backend("threads")
+
+
 class TestLearningObjectives(unittest.TestCase):
     """Test that koans cover the intended learning objectives"""
 